@@ -91,6 +91,9 @@ done
 
 %install
 %pyproject_install
+# Prebuild the license index so it doesn't need to be built on every run
+PYTHONPATH=%{buildroot}%{python3_sitelib} %{python3} -m go_vendor_tools.cli.go_vendor_license \
+    build_license_index -o %{buildroot}%{python3_sitelib}/go_vendor_tools/fedora-license-index.json
 %pyproject_save_files go_vendor_tools -l
 
 # Install RPM macros
@@ -124,6 +127,8 @@ export MACRO_DIR=%{buildroot}%{_rpmmacrodir}
 %files -f %{pyproject_files}
 # Install top-level markdown files
 %doc *.md
+# Written by build_license_index, so it's not in the wheel's RECORD
+%{python3_sitelib}/go_vendor_tools/fedora-license-index.json
 %{_bindir}/gocheck2
 %{_bindir}/go_vendor*
 %{bash_completions_dir}/go*
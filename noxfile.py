@@ -28,6 +28,7 @@ LINT_SESSIONS = ("formatters", "codeqa", "typing")
 LINT_FILES = (
     f"src/{PROJECT}",
     "tests/pytests",
+    "tests/benchmarks",
     "noxfile.py",
     "contrib",
     *iglob("doc/man/*.py"),
@@ -207,6 +208,39 @@ def covtest(session: nox.Session):
         session.notify(target, ["--cov"])
 
 
+@nox.session
+def benchmark(session: nox.Session):
+    """
+    Time the license pipeline on a synthetic vendor tree.
+    Pass `-- -o results.json` to store the results and
+    `-- --baseline results.json` to compare against them.
+    """
+    install(session, ".", editable=True)
+    session.run(
+        "python", "tests/benchmarks/bench_license_pipeline.py", *session.posargs
+    )
+
+
+@nox.session(name="benchmark-startup")
+def benchmark_startup(session: nox.Session):
+    """
+    Measure import times and the startup time of the subcommands that run in
+    every RPM build
+    """
+    install(session, ".", editable=True)
+    session.run("python", "tests/benchmarks/bench_startup.py", *session.posargs)
+
+
+@nox.session(name="benchmark-memory")
+def benchmark_memory(session: nox.Session):
+    """
+    Measure the memory used by LicenseData's paths on a synthetic tree with
+    50k license files
+    """
+    install(session, ".", editable=True)
+    session.run("python", "tests/benchmarks/bench_memory.py", *session.posargs)
+
+
 @nox.session(name="all")
 def all_(session: nox.Session):
     lint(session)
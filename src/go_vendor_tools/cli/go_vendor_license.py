@@ -7,7 +7,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import shutil
+import sqlite3
 import sys
 from collections.abc import Collection, Iterable, Iterator, MutableSequence, Sequence
 from contextlib import ExitStack, contextmanager
@@ -34,16 +36,39 @@ from go_vendor_tools.config.licenses import (
     LicenseEntry,
     create_license_config,
 )
+from go_vendor_tools.config.utils import get_envvar_boolean
 from go_vendor_tools.exceptions import VendorToolsError
 from go_vendor_tools.gomod import (
     get_go_module_dirs,
     get_go_module_names,
     get_unlicensed_mods,
 )
-from go_vendor_tools.hashing import get_hash
-from go_vendor_tools.license_detection.base import LicenseData, LicenseDetector
+from go_vendor_tools.hashing import get_hash, hash_memo
+from go_vendor_tools.license_detection.base import (
+    DetectorInputs,
+    LicenseData,
+    LicenseDetector,
+    file_hash_store,
+    get_file_hash_store,
+)
+from go_vendor_tools.license_detection.cache import (
+    CACHE_FILE_NAME,
+    DEFAULT_CACHE_MAX_SIZE,
+    DEFAULT_LICENSE_DATA_CACHE_MAX_SIZE,
+    LICENSE_DATA_CACHE_FILE_NAME,
+    DetectionCache,
+    get_cache_namespace,
+)
 from go_vendor_tools.license_detection.load import DETECTORS, get_detectors
-from go_vendor_tools.licensing import compare_licenses, simplify_license
+from go_vendor_tools.licensing import (
+    DEFAULT_EXPRESSION_CACHE_SIZE,
+    PREBUILT_LICENSE_INDEX_PATH,
+    compare_licenses,
+    dump_license_index,
+    get_expression_cache_info,
+    set_expression_cache_size,
+    simplify_license,
+)
 from go_vendor_tools.specfile import VendorSpecfile
 
 if HAS_TOMLKIT:
@@ -61,6 +86,8 @@ RED = "\033[31m"  # ]
 CLEAR = "\033[0m"  # ]
 
 MANUALLY_DETECTING_LICENSES_URL = "https://fedora.gitlab.io/sigs/go/go-vendor-tools/scenarios/#manually-detecting-licenses"
+# DetectionCache namespace for whole-package LicenseData (see detect_memoized())
+LICENSE_DATA_MEMO_NAMESPACE = "license-data"
 
 
 def red(__msg: str, /, *, file: IO[str] | None = None) -> None:
@@ -200,6 +227,44 @@ def get_parser() -> argparse.ArgumentParser:
         dest="detector_config",
         action="append",
     )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=get_envvar_boolean("GO_VENDOR_LICENSE_CACHE", True),
+        help="Whether to cache license detection results in the cache"
+        " directory."
+        " Results are cached for each license file and, in a separate cache"
+        " file, for whole packages whose license files, go.mod, go.sum,"
+        " modules.txt, and license configuration are unchanged."
+        " Defaults to $GO_VENDOR_LICENSE_CACHE or True.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=os.environ.get("GO_VENDOR_LICENSE_CACHE_DIR"),
+        help="Directory in which to store the license detection caches."
+        " Defaults to $GO_VENDOR_LICENSE_CACHE_DIR or the go-vendor-tools"
+        " directory in the user's cache directory.",
+    )
+    parser.add_argument(
+        "--hash-memo",
+        type=Path,
+        default=os.environ.get("GO_VENDOR_LICENSE_HASH_MEMO"),
+        help="Path to a file in which to remember license file hashes between"
+        " runs in the same build tree."
+        " Defaults to $GO_VENDOR_LICENSE_HASH_MEMO or disabled.",
+    )
+    parser.add_argument(
+        "--expression-cache-size",
+        type=_expression_cache_size,
+        default=os.environ.get(
+            "GO_VENDOR_LICENSE_EXPRESSION_CACHE_SIZE",
+            str(DEFAULT_EXPRESSION_CACHE_SIZE),
+        ),
+        help="Maximum number of parsed and simplified license expressions to"
+        " cache or 'unbounded'."
+        " Defaults to $GO_VENDOR_LICENSE_EXPRESSION_CACHE_SIZE or %(default)s.",
+    )
     parser.set_defaults(detector_find_only=False)
     subparsers = parser.add_subparsers(dest="subcommand")
     subparsers.required = True
@@ -291,6 +356,24 @@ def get_parser() -> argparse.ArgumentParser:
         """,
     )
     _add_json_argument(report_parser)
+    report_parser.add_argument(
+        "--reuse-json",
+        type=Path,
+        help=_fmt_oneline_help("""
+        Reuse the license data written by `install --write-json` instead of
+        running the license detector if the license files, vendor/modules.txt,
+        configuration, and detector have not changed since.
+        Otherwise, detect licenses as usual.
+        """),
+    )
+    report_parser.add_argument(
+        "--expression-cache-stats",
+        action=argparse.BooleanOptionalAction,
+        default=get_envvar_boolean("GO_VENDOR_LICENSE_EXPRESSION_CACHE_STATS", False),
+        help="Print license expression cache statistics to stderr when the"
+        " command finishes."
+        " Defaults to $GO_VENDOR_LICENSE_EXPRESSION_CACHE_STATS or False.",
+    )
     report_parser.add_argument(
         "--write-config", help="Write a base config.", action="store_true"
     )
@@ -303,12 +386,29 @@ def get_parser() -> argparse.ArgumentParser:
     explict_parser.add_argument(
         "-f",
         "--file",
-        dest="license_file",
-        required=True,
+        dest="license_files",
+        action="append",
+        nargs="+",
+        default=[],
+        metavar=("PATH", "EXPRESSION"),
+        help="Path to file (relative to CWD) to add to license config"
+        " and its SPDX license expression."
+        " Can be passed multiple times.",
+    )
+    explict_parser.add_argument(
+        "-i",
+        "--input",
+        dest="explicit_input",
         type=Path,
-        help="Path to file (relative to CWD) to add to license config",
+        help="Read tab-separated file paths and expressions from a file"
+        " or a JSON file ending in .json."
+        f" See {MANUALLY_DETECTING_LICENSES_URL}.",
+    )
+    explict_parser.add_argument(
+        "license_expression",
+        nargs="?",
+        help="SPDX license expression for a single --file passed without one",
     )
-    explict_parser.add_argument("license_expression", help="SPDX license expression")
     install_parser = subparsers.add_parser(
         "install", description=f"INTERNAL: {install_command.__doc__}"
     )
@@ -332,9 +432,14 @@ def get_parser() -> argparse.ArgumentParser:
         " bundled(golang()) Provides.",
     )
     install_parser.set_defaults(detector_find_only=True)
-    # TODO(gotmax23): Should we support writing JSON from the install command
-    # or just reading it?
-    # _add_json_argument(install_parser)
+    _add_json_argument(
+        install_parser,
+        help=_fmt_oneline_help("""
+        Detect licenses and write the license data to a JSON file for
+        `report --reuse-json`.
+        This requires the license detector's full dependencies.
+        """),
+    )
     generate_buildrequires_parser = subparsers.add_parser(
         "generate_buildrequires",
         description="Internal command for %%go_vendor_license_buildrequires",
@@ -345,9 +450,64 @@ def get_parser() -> argparse.ArgumentParser:
         action="store_true",
         dest="detector_find_only",
     )
+    build_license_index_parser = subparsers.add_parser(
+        "build_license_index",
+        description=f"INTERNAL: {build_license_index_command.__doc__}",
+    )
+    build_license_index_parser.add_argument(
+        "-o",
+        "--output",
+        dest="license_index_output",
+        type=Path,
+        default=PREBUILT_LICENSE_INDEX_PATH,
+        help="Default: %(default)s",
+    )
     return parser
 
 
+def _expression_cache_size(value: str) -> int | None:
+    if value.lower() == "unbounded":
+        return None
+    try:
+        size = int(value)
+    except ValueError:
+        size = -1
+    if size < 0:
+        raise argparse.ArgumentTypeError(
+            f"{value!r} is not a non-negative integer or 'unbounded'"
+        )
+    return size
+
+
+def print_expression_cache_stats() -> None:
+    file = sys.stderr
+    print("License expression cache statistics:", file=file)
+    for name, info in get_expression_cache_info().items():
+        lookups = info.hits + info.misses
+        hit_rate = info.hits / lookups if lookups else 0
+        maxsize = "unbounded" if info.maxsize is None else info.maxsize
+        print(
+            f"- {name}: {info.hits} hits, {info.misses} misses"
+            f" ({hit_rate:.1%} hit rate), {info.evictions} evictions,"
+            f" size {info.currsize}/{maxsize}",
+            file=file,
+        )
+
+
+def open_detection_cache(
+    directory: Path | None,
+    file_name: str = CACHE_FILE_NAME,
+    max_size: int = DEFAULT_CACHE_MAX_SIZE,
+) -> DetectionCache | None:
+    try:
+        if directory is None:
+            return DetectionCache.open_default(file_name, max_size)
+        return DetectionCache(directory / file_name, max_size)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Failed to open the license detection cache: {exc}", file=sys.stderr)
+        return None
+
+
 def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
     """
     Parse arguments and return an `argparse.Namespace`
@@ -357,7 +517,8 @@ def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
         argcomplete.autocomplete(parser)
     args = parser.parse_args(argv)
     args.directory = list(map(Path, args.directory or (".")))
-    if args.subcommand not in ("explicit",):
+    set_expression_cache_size(args.expression_cache_size)
+    if args.subcommand not in ("explicit", "build_license_index"):
         loaded = load_config(
             args.config_path, allow_missing=getattr(args, "write_config", False)
         )
@@ -365,6 +526,8 @@ def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
         args.global_config = loaded
         if not args.detector_name:
             args.detector_name = args.config["detector"]
+    if args.subcommand == "install" and args.write_json:
+        args.detector_find_only = False
     if args.subcommand in ("report", "install"):
         args.detector, args.autofill_detector = choose_license_detector(
             args.detector_name,
@@ -375,11 +538,44 @@ def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
         )
         # TODO(anyone): Replace the print if/when we implement more granular logging
         print("Using detector:", args.detector.NAME, file=sys.stderr)
+        # Set by detection_caches()
+        args.license_data_cache = None
     global COLOR  # noqa: PLW0603
     COLOR = args.color
     return args
 
 
+@contextmanager
+def detection_caches(args: argparse.Namespace) -> Iterator[None]:
+    """
+    Open the license detection caches for the report and install commands,
+    pass them to the detectors, and close them on exit.
+    Does nothing if caching is disabled.
+    """
+    if (
+        args.subcommand not in ("report", "install")
+        or not args.cache
+        or args.detector_find_only
+    ):
+        yield
+        return
+    with ExitStack() as stack:
+        cache = open_detection_cache(args.cache_dir)
+        if cache is not None:
+            stack.enter_context(cache)
+        args.detector.cache = cache
+        if args.autofill_detector:
+            args.autofill_detector.cache = cache
+        args.license_data_cache = open_detection_cache(
+            args.cache_dir,
+            LICENSE_DATA_CACHE_FILE_NAME,
+            DEFAULT_LICENSE_DATA_CACHE_MAX_SIZE,
+        )
+        if args.license_data_cache is not None:
+            stack.enter_context(args.license_data_cache)
+        yield
+
+
 def bullet_iterator(it: Iterable[object], bullet: str = "- ") -> Iterator[str]:
     for item in it:
         yield bullet + str(item)
@@ -445,9 +641,159 @@ def print_licenses(
     )
 
 
-def write_license_json(data: LicenseData, file: Path) -> None:
+def write_license_json(
+    data: LicenseData, file: Path, fingerprint: str | None = None
+) -> None:
+    """
+    Args:
+        data: LicenseData
+        file: JSON file to write
+        fingerprint: Fingerprint from `scan_license_inputs()` to store
+    """
+    extra = None if fingerprint is None else {"input_fingerprint": fingerprint}
     with file.open("w", encoding="utf-8") as fp:
-        json.dump(data.to_jsonable(), fp, indent=2)
+        data.write_json(fp, extra)
+
+
+def scan_license_inputs(
+    detector: LicenseDetector,
+    directory: Path,
+    reuse_roots: Collection[Path],
+    go_mod_dir: str | None,
+) -> DetectorInputs | None:
+    """
+    Find the inputs of `detector.detect()` for a whole package and fingerprint
+    them: the license files found in `directory`, the license configuration,
+    the detector, and the go.mod, go.sum, and vendor/modules.txt files
+
+    Returns:
+        The DetectorInputs or None if the detector cannot fingerprint its
+        inputs
+    """
+    inputs = detector.scan_inputs(
+        directory,
+        reuse_roots,
+        [
+            Path(go_mod_dir or ".", name)
+            for name in ("go.mod", "go.sum", "vendor/modules.txt")
+        ],
+    )
+    if inputs is None:
+        return None
+    return inputs._replace(
+        fingerprint=get_cache_namespace(__version__, inputs.fingerprint)
+    )
+
+
+def load_reusable_license_data(
+    file: Path,
+    detector: LicenseDetector,
+    directory: Path,
+    inputs: DetectorInputs | None,
+) -> LicenseData | None:
+    """
+    Load license data written by `install --write-json`
+
+    Args:
+        file: JSON file
+        detector: LicenseDetector
+        directory:
+            Directory that the data is reused for.
+            The fingerprint doesn't include the location of the tree, so this
+            replaces the directory stored in `file`.
+        inputs: Result of `scan_license_inputs()`
+
+    Returns:
+        The LicenseData or None if `file` does not exist or if the inputs'
+        fingerprint has changed
+    """
+    try:
+        with file.open(encoding="utf-8") as fp:
+            jsonable = json.load(fp)
+        data = detector.LICENSE_DATA_CLASS.from_jsonable(jsonable)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"Failed to load license data from {file}: {exc}", file=sys.stderr)
+        return None
+    if inputs is None:
+        print(
+            f"Not reusing license data from {file}:"
+            f" The {detector.NAME} detector's inputs cannot be fingerprinted",
+            file=sys.stderr,
+        )
+        return None
+    if inputs.fingerprint != jsonable.get("input_fingerprint"):
+        print(
+            f"Not reusing license data from {file}: The inputs have changed",
+            file=sys.stderr,
+        )
+        return None
+    print(f"Reusing license data from {file}", file=sys.stderr)
+    return data.replace(directory=directory)
+
+
+def detect_memoized(
+    detector: LicenseDetector,
+    directory: Path,
+    reuse_roots: Collection[Path],
+    inputs: DetectorInputs | None,
+    cache: DetectionCache | None,
+) -> LicenseData:
+    """
+    Run `detector.detect()` or load its results for an identical package from
+    `cache`.
+    The license files in `inputs` are passed on to `detector.detect()`, so the
+    tree is only searched once.
+
+    Args:
+        detector: LicenseDetector
+        directory: Directory
+        reuse_roots: Directories to search for REUSE-style LICENSES directory
+        inputs: Result of `scan_license_inputs()`
+        cache:
+            Cache for whole-package license data or None to disable
+            memoization
+    """
+    if cache is None or inputs is None:
+        return detector.detect(directory, reuse_roots, inputs)
+    key = inputs.fingerprint
+    if (jsonable := cache.get(LICENSE_DATA_MEMO_NAMESPACE, key)) is not None:
+        try:
+            data = detector.LICENSE_DATA_CLASS.from_jsonable(jsonable)
+        except (ValueError, TypeError, KeyError) as exc:
+            print(f"Failed to load memoized license data: {exc}", file=sys.stderr)
+        else:
+            print("Using memoized license data", file=sys.stderr)
+            return data.replace(directory=directory)
+    data = detector.detect(directory, reuse_roots, inputs)
+    cache.put_many(LICENSE_DATA_MEMO_NAMESPACE, [(key, data.to_jsonable())])
+    return data
+
+
+def get_report_license_data(
+    detector: LicenseDetector,
+    directory: Path,
+    reuse_roots: Collection[Path],
+    go_mod_dir: str | None,
+    *,
+    reuse_json: Path | None,
+    cache: DetectionCache | None,
+) -> LicenseData:
+    """
+    Load the license data from `reuse_json` if its inputs are unchanged or
+    detect it
+    """
+    inputs = (
+        scan_license_inputs(detector, directory, reuse_roots, go_mod_dir)
+        if reuse_json or cache is not None
+        else None
+    )
+    if reuse_json:
+        data = load_reusable_license_data(reuse_json, detector, directory, inputs)
+        if data is not None:
+            return data
+    return detect_memoized(detector, directory, reuse_roots, inputs, cache)
 
 
 class _PromptMissingResult(NamedTuple):
@@ -473,6 +819,7 @@ def get_missing_licenses(
     undetected_licenses = set(data.undetected_licenses)
     unmatched_manual_licenses = set(data.unmatched_manual_licenses)
     license_map: dict[Path, str] = dict(data.license_map)
+    index = index_license_entries(entries)
     if autofill_detector:
         name = autofill_detector.NAME
         print(
@@ -486,13 +833,19 @@ def get_missing_licenses(
             license_map.update(extra_license_map)
             undetected_licenses -= extra_license_map.keys()
             unmatched_manual_licenses -= extra_license_map.keys()
+            hashes = get_file_hash_store().get_hashes(
+                data.directory / path for path in extra_license_map
+            )
             for undetected, expression in extra_license_map.items():
+                sha256sum = hashes[data.directory / undetected]
+                if sha256sum is None:
+                    sys.exit(f"Failed to read {data.directory / undetected}")
                 entry_dict = LicenseEntry(
                     path=str(undetected),
-                    sha256sum=get_hash(data.directory / undetected),
+                    sha256sum=sha256sum,
                     expression=expression,
                 )
-                replace_entry(entries, entry_dict, undetected)
+                replace_entry(entries, entry_dict, undetected, index)
             print(
                 f"Autofilled {len(extra_license_map)} manual license entries",
                 file=sys.stderr,
@@ -515,7 +868,7 @@ def get_missing_licenses(
                 sha256sum=get_hash(data.directory / undetected),
                 expression=expression,
             )
-            replace_entry(entries, entry_dict, undetected)
+            replace_entry(entries, entry_dict, undetected, index)
             undetected_licenses.remove(undetected)
             unmatched_manual_licenses.discard(undetected)
         assert not undetected_licenses
@@ -667,6 +1020,8 @@ def report_command(args: argparse.Namespace) -> None:
     mode: str = args.mode
     verify: str | None = args.verify
     write_json: Path | None = args.write_json
+    reuse_json: Path | None = args.reuse_json
+    license_data_cache: DetectionCache | None = args.license_data_cache
     write_config: bool = (
         args.write_config or args.prompt or autofill_detector is not None
     )
@@ -695,7 +1050,8 @@ def report_command(args: argparse.Namespace) -> None:
             directory / (go_mod_dir or "."),
             allow_missing=True,  # Allow this to be missing for now
         )
-        license_data: LicenseData = detector.detect(
+        license_data = get_report_license_data(
+            detector,
             directory,
             get_go_module_dirs(
                 directory,
@@ -703,6 +1059,9 @@ def report_command(args: argparse.Namespace) -> None:
                 go_mod_dir=go_mod_dir,
                 go_module_names=go_module_names,
             ),
+            go_mod_dir,
+            reuse_json=reuse_json,
+            cache=license_data_cache,
         )
         unlicensed_mods = (
             set()
@@ -806,13 +1165,25 @@ def install_command(args: argparse.Namespace) -> None:
     install_filelist: Path = args.install_filelist
     global_config: BaseConfig = args.global_config
     install_modules_txt: bool = args.install_modules_txt
+    write_json: Path | None = args.write_json
+    license_data_cache: DetectionCache | None = args.license_data_cache
     del args
     go_mod_dir = global_config["general"]["go_mod_dir"]
 
-    license_files = detector.find_license_files(
-        directory,
-        get_go_module_dirs(directory, relative_paths=True, go_mod_dir=go_mod_dir),
+    reuse_roots = get_go_module_dirs(
+        directory, relative_paths=True, go_mod_dir=go_mod_dir
     )
+    license_files = detector.find_license_files(directory, reuse_roots)
+    if write_json:
+        # The detected data is only written to the JSON file.
+        # The installed files are the same with or without --write-json.
+        inputs = scan_license_inputs(detector, directory, reuse_roots, go_mod_dir)
+        license_data = detect_memoized(
+            detector, directory, reuse_roots, inputs, license_data_cache
+        )
+        write_license_json(
+            license_data, write_json, None if inputs is None else inputs.fingerprint
+        )
     modules_dot_txt = Path(go_mod_dir or ".", "vendor/modules.txt")
     if install_modules_txt:
         if modules_dot_txt.is_file():
@@ -837,22 +1208,119 @@ def get_relpath(base_directory: Path, path: Path) -> Path:
     return path
 
 
+def index_license_entries(
+    entries: Iterable[LicenseEntry],
+) -> dict[Path, LicenseEntry]:
+    """
+    Index license entries by path for `replace_entry()`
+    """
+    index: dict[Path, LicenseEntry] = {}
+    for entry in entries:
+        index.setdefault(Path(entry["path"]), entry)
+    return index
+
+
 def replace_entry(
-    data: MutableSequence[LicenseEntry], new_entry: LicenseEntry, relpath: Path
+    data: MutableSequence[LicenseEntry],
+    new_entry: LicenseEntry,
+    relpath: Path,
+    index: dict[Path, LicenseEntry] | None = None,
 ) -> None:
-    for entry in data:
-        if entry == new_entry:
-            return
-        if Path(entry["path"]) == relpath:
-            cast(dict, entry).clear()
-            entry.update(new_entry)
-            return
-    data.append(new_entry)
+    """
+    Replace the entry for `relpath` in `data` with `new_entry` or append it.
+    Pass an `index` from `index_license_entries()` when replacing multiple
+    entries to avoid scanning `data` each time.
+    The index is updated in place.
+    """
+    if index is None:
+        index = index_license_entries(data)
+    entry = index.get(relpath)
+    if entry is None:
+        data.append(new_entry)
+        # tomlkit converts the dict to a Table
+        index[relpath] = data[-1]
+    elif entry != new_entry:
+        cast(dict, entry).clear()
+        entry.update(new_entry)
+
+
+def load_explicit_entries(path: Path) -> list[tuple[Path, str]]:
+    """
+    Load (file, expression) pairs for the explicit command.
+
+    JSON files contain a list of objects with `path` and `expression` keys or
+    a mapping of paths to expressions.
+    Other files contain tab-separated paths and expressions, one pair per line.
+    Blank lines and lines starting with `#` are ignored.
+    """
+    with path.open("r", encoding="utf-8") as fp:
+        if path.suffix == ".json":
+            loaded = json.load(fp)
+            if isinstance(loaded, dict):
+                return [(Path(file), expr) for file, expr in loaded.items()]
+            try:
+                return [(Path(item["path"]), item["expression"]) for item in loaded]
+            except (KeyError, TypeError) as exc:
+                sys.exit(f"{path}: Invalid license entry: {exc}")
+        pairs: list[tuple[Path, str]] = []
+        for lineno, raw_line in enumerate(fp, 1):
+            line = raw_line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            file, sep, expression = line.partition("\t")
+            if not sep:
+                sys.exit(
+                    f"{path}:{lineno}: Expected a tab-separated path and expression"
+                )
+            pairs.append((Path(file), expression.strip()))
+        return pairs
+
+
+def get_explicit_entries(args: argparse.Namespace) -> list[tuple[Path, str]]:
+    entries: list[tuple[Path, str | None]] = []
+    for values in args.license_files:
+        if len(values) > 2:
+            sys.exit(
+                f"--file {values[0]}: Expected one license expression"
+                f" but got {len(values) - 1}."
+                " Quote expressions that contain spaces."
+            )
+        entries.append((Path(values[0]), values[1] if len(values) > 1 else None))
+    missing = [file for file, expression in entries if expression is None]
+    expression: str | None = args.license_expression
+    if expression is not None:
+        if not entries:
+            sys.exit(
+                "Got a license expression without any --file arguments."
+                " Expressions for files from --input belong in the input file."
+            )
+        if len(missing) != 1:
+            sys.exit(
+                f"Got a license expression argument but {len(missing)} --file"
+                " arguments without an expression."
+                " Pass each file and its expression as --file PATH EXPRESSION."
+            )
+    elif missing:
+        sys.exit(
+            f"No license expression for --file {missing[0]}."
+            " Pass each file and its expression as --file PATH EXPRESSION."
+        )
+    # The license expression argument belongs to the --file without one
+    pairs = [
+        (file, file_expression if file_expression is not None else expression or "")
+        for file, file_expression in entries
+    ]
+    if args.explicit_input:
+        pairs.extend(load_explicit_entries(args.explicit_input))
+    if not pairs:
+        sys.exit("No license files were specified!")
+    return pairs
 
 
 def explicit_command(args: argparse.Namespace) -> None:
     if not args.config_path:
         sys.exit("--config must be specified!")
+    pairs = get_explicit_entries(args)
     loaded = load_tomlkit_if_exists(args.config_path)
 
     if "licensing" not in loaded:
@@ -860,22 +1328,38 @@ def explicit_command(args: argparse.Namespace) -> None:
     data = loaded["licensing"]
 
     licenses = cast(dict, data).setdefault("licenses", tomlkit.aot())
-    relpath = get_relpath(args.directory[0], args.license_file)
-    try:
-        expression = (
-            simplify_license(args.license_expression) if args.license_expression else ""
+    index = index_license_entries(licenses)
+    hashes = get_file_hash_store().get_hashes(file for file, _ in pairs)
+    for license_file, license_expression in pairs:
+        relpath = get_relpath(args.directory[0], license_file)
+        try:
+            expression = (
+                simplify_license(license_expression) if license_expression else ""
+            )
+        except ExpressionError as exc:
+            sys.exit(f"Failed to parse license for {license_file}: {exc}")
+        sha256sum = hashes[license_file]
+        if sha256sum is None:
+            sys.exit(f"Failed to read {license_file}")
+        entry = LicenseEntry(
+            path=str(relpath),
+            sha256sum=sha256sum,
+            expression=expression,
         )
-    except ExpressionError as exc:
-        sys.exit(f"Failed to parse license: {exc}")
-    entry = LicenseEntry(
-        path=str(relpath),
-        sha256sum=get_hash(args.license_file),
-        expression=expression,
-    )
-    replace_entry(licenses, entry, relpath)
+        replace_entry(licenses, entry, relpath, index)
     tomlkit_dump(loaded, args.config_path)
 
 
+def build_license_index_command(args: argparse.Namespace) -> None:
+    """
+    Prebuild the Fedora license index that's used to parse license expressions
+    """
+    output: Path = args.license_index_output
+    del args
+    dump_license_index(output)
+    print(f"Wrote {output}", file=sys.stderr)
+
+
 def generate_buildrequires_command(args: argparse.Namespace) -> None:
     detector: str = args.detector_name
     find_only: bool = args.detector_find_only
@@ -897,15 +1381,25 @@ def generate_buildrequires_command(args: argparse.Namespace) -> None:
 
 def main(argv: list[str] | None = None) -> None:
     args = parseargs(argv)
-    with catch_vendor_tools_error():
+    with ExitStack() as stack:
+        stack.enter_context(catch_vendor_tools_error())
+        stack.enter_context(hash_memo(args.hash_memo))
+        stack.enter_context(file_hash_store())
+        stack.enter_context(detection_caches(args))
         if args.subcommand == "report":
-            report_command(args)
+            try:
+                report_command(args)
+            finally:
+                if args.expression_cache_stats:
+                    print_expression_cache_stats()
         elif args.subcommand == "explicit":
             explicit_command(args)
         elif args.subcommand == "install":
             install_command(args)
         elif args.subcommand == "generate_buildrequires":
             generate_buildrequires_command(args)
+        elif args.subcommand == "build_license_index":
+            build_license_index_command(args)
 
 
 if __name__ == "__main__":
@@ -10,6 +10,13 @@ from __future__ import annotations
 import os
 from typing import Any, TypedDict, cast
 
+from go_vendor_tools.exceptions import ConfigError
+
+SEARCH_MODES = ("full", "modules")
+DEFAULT_SEARCH_MODE = "full"
+DEFAULT_SEARCH_MAX_DEPTH = 2
+DEFAULT_SEARCH_JOBS_STR = os.environ.get("GO_VENDOR_LICENSE_SEARCH_JOBS")
+
 
 class LicenseEntry(TypedDict):
     path: str
@@ -25,8 +32,12 @@ class LicenseConfig(TypedDict):
     detector: str | None
     detector_config: dict[str, str]
     licenses: list[LicenseEntry]
+    exclude_globs: list[str]
     exclude_directories: list[str]
     exclude_files: list[str]
+    search_mode: str
+    search_max_depth: int
+    search_jobs: int
 
 
 def create_license_config(data: dict[str, Any] | None = None) -> LicenseConfig:
@@ -38,4 +49,19 @@ def create_license_config(data: dict[str, Any] | None = None) -> LicenseConfig:
     data.setdefault("exclude_globs", [])
     data.setdefault("exclude_directories", [])
     data.setdefault("exclude_files", [])
+    search_mode = data.setdefault("search_mode", DEFAULT_SEARCH_MODE)
+    if search_mode not in SEARCH_MODES:
+        raise ConfigError(
+            f"licensing.search_mode: {search_mode!r} is not one of {SEARCH_MODES}"
+        )
+    data["search_max_depth"] = int(
+        data.setdefault("search_max_depth", DEFAULT_SEARCH_MAX_DEPTH)
+    )
+    if data["search_max_depth"] < 0:
+        raise ConfigError("licensing.search_max_depth must not be negative")
+    data["search_jobs"] = int(
+        data.setdefault("search_jobs", DEFAULT_SEARCH_JOBS_STR or 1)
+    )
+    if data["search_jobs"] < 1:
+        raise ConfigError("licensing.search_jobs must be at least 1")
     return cast("LicenseConfig", data)
@@ -8,6 +8,7 @@ Utilities for reading configuartion
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
 FALSY_STRINGS = frozenset(("", "0", "false"))
 
@@ -20,3 +21,11 @@ def str_to_bool(value: str | None, default: bool) -> bool:
     if value is None:
         return default
     return value.lower() not in FALSY_STRINGS
+
+
+def get_user_cache_dir() -> Path:
+    """
+    Return the go-vendor-tools directory in the user's XDG cache directory
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base, "go-vendor-tools")
@@ -7,20 +7,241 @@ SHA256 hashing utilities
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
 import hmac
+import json
+import mmap
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import FileIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from _typeshed import StrPath
 
-def get_hash(file: Path) -> str:
+BUFFER_SIZE = 1024 * 1024
+# Files at least this large are hashed with mmap.
+# See tests/benchmarks/bench_hashing.py.
+MMAP_THRESHOLD = 256 * 1024
+
+# Each thread reuses its own read buffer
+_local = threading.local()
+
+
+def _get_buffer() -> memoryview:
+    try:
+        return _local.buffer
+    except AttributeError:
+        _local.buffer = buffer = memoryview(bytearray(BUFFER_SIZE))
+        return buffer
+
+
+def _hash_readinto(fp: FileIO) -> str:
     hasher = hashlib.sha256()
-    with file.open("rb") as fp:
-        while chunk := fp.read(4096):
-            hasher.update(chunk)
+    buffer = _get_buffer()
+    while size := fp.readinto(buffer):
+        hasher.update(buffer[:size])
     return hasher.hexdigest()
 
 
+def _hash_file_digest(fp: FileIO) -> str:
+    return hashlib.file_digest(fp, "sha256").hexdigest()
+
+
+def _hash_mmap(fp: FileIO) -> str:
+    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return hashlib.sha256(mapped).hexdigest()
+
+
+# hashlib.file_digest() was added in Python 3.11
+_hash_large_fallback = (
+    _hash_file_digest if hasattr(hashlib, "file_digest") else _hash_readinto
+)
+
+
+def _hash_file(file: StrPath) -> str:
+    with open(file, "rb", buffering=0) as fp:
+        # Most license files are small and are hashed fastest with the
+        # preallocated buffer. file_digest() allocates a new buffer each call.
+        if os.fstat(fp.fileno()).st_size < MMAP_THRESHOLD:
+            return _hash_readinto(fp)
+        try:
+            # Hash the whole file in one call without copying it into
+            # Python buffers
+            return _hash_mmap(fp)
+        except (OSError, ValueError):
+            # mmap is not supported for this file (e.g., on some special
+            # filesystems)
+            fp.seek(0)
+            return _hash_large_fallback(fp)
+
+
+def _stat_key(file: StrPath) -> tuple[str, int]:
+    st = os.stat(file)
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}", st.st_mtime_ns
+
+
+class HashMemo:
+    """
+    Memo of file hashes keyed by the files' (device, inode, size, mtime_ns)
+    that's persisted to a JSON sidecar file.
+    Changing a file changes its stat key, so stale digests are never used.
+
+    Files modified within the last `RACY_SECONDS` are not memoized, as they
+    may be modified again without changing their mtime on filesystems with
+    coarse timestamps.
+    Only the entries used in the current run are written back, so the sidecar
+    does not grow without bound.
+    """
+
+    FORMAT_VERSION = 1
+    RACY_SECONDS = 2
+
+    def __init__(self, path: StrPath) -> None:
+        self.path = Path(path)
+        self._entries: dict[str, str] = {}
+        self._used: dict[str, str] = {}
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self.FORMAT_VERSION:
+            self._entries = data["hashes"]
+
+    def get_hash(self, file: StrPath) -> str:
+        key, mtime_ns = _stat_key(file)
+        with self._lock:
+            digest = self._entries.get(key)
+        if digest is None:
+            digest = _hash_file(file)
+            # Don't store the digest if the file changed while it was hashed
+            if (
+                time.time_ns() - mtime_ns > self.RACY_SECONDS * 1_000_000_000
+                and _stat_key(file)[0] == key
+            ):
+                with self._lock:
+                    self._entries[key] = digest
+            else:
+                return digest
+        with self._lock:
+            self._used[key] = digest
+        return digest
+
+    def save(self) -> None:
+        """
+        Atomically write the memo to the sidecar file
+        """
+        with self._lock:
+            data = {"version": self.FORMAT_VERSION, "hashes": dict(self._used)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+_memo: HashMemo | None = None
+
+
+@contextlib.contextmanager
+def hash_memo(path: StrPath | None) -> Iterator[HashMemo | None]:
+    """
+    Use a HashMemo stored at `path` for `get_hash()` and the functions that
+    use it within the context and save it on exit.
+    Does nothing if `path` is None.
+    """
+    global _memo  # noqa: PLW0603
+    if path is None:
+        yield None
+        return
+    memo = HashMemo(path)
+    old, _memo = _memo, memo
+    try:
+        yield memo
+    finally:
+        _memo = old
+        # The memo is only an optimization, so don't fail if it can't be saved
+        with contextlib.suppress(OSError):
+            memo.save()
+
+
+def get_hash_memo() -> HashMemo | None:
+    """
+    Returns:
+        The HashMemo activated by `hash_memo()` or None
+    """
+    return _memo
+
+
+def get_hash(file: Path) -> str:
+    if _memo is not None:
+        return _memo.get_hash(file)
+    return _hash_file(file)
+
+
+def _get_hash_or_none(file: Path, hash_func: Callable[[Path], str]) -> str | None:
+    if not file.is_file():
+        return None
+    try:
+        return hash_func(file)
+    except OSError:
+        return None
+
+
+def get_hashes(
+    files: Iterable[Path],
+    jobs: int | None = None,
+    hash_func: Callable[[Path], str] | None = None,
+) -> dict[Path, str | None]:
+    """
+    Hash multiple files concurrently.
+    hashlib releases the GIL while hashing, so this scales across threads.
+
+    Args:
+        files: Files to hash
+        jobs:
+            Number of threads to use.
+            Defaults to ThreadPoolExecutor's default.
+        hash_func: Function to hash a single file. Defaults to `get_hash()`.
+
+    Returns:
+        Mapping of files to hex digests or None for paths that are not regular
+        files or that cannot be read
+    """
+    func = partial(_get_hash_or_none, hash_func=hash_func or get_hash)
+    unique = list(dict.fromkeys(files))
+    if len(unique) <= 1 or jobs == 1:
+        return {file: func(file) for file in unique}
+    with ThreadPoolExecutor(jobs) as executor:
+        return dict(zip(unique, executor.map(func, unique)))
+
+
 def verify_hash(file: Path, sha256sum: str) -> bool:
     if not file.is_file():
         return False
     return hmac.compare_digest(get_hash(file), sha256sum)
+
+
+def verify_hashes(
+    entries: Iterable[tuple[Path, str]],
+    jobs: int | None = None,
+    hash_func: Callable[[Path], str] | None = None,
+) -> list[bool]:
+    """
+    Verify multiple (file, sha256sum) pairs concurrently
+
+    Returns:
+        List of whether each file's hash matches
+    """
+    entries = list(entries)
+    hashes = get_hashes((file for file, _ in entries), jobs, hash_func)
+    return [
+        (digest := hashes[file]) is not None and hmac.compare_digest(digest, sha256sum)
+        for file, sha256sum in entries
+    ]
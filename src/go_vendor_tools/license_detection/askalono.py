@@ -11,9 +11,12 @@ import dataclasses
 import json
 import shutil
 import subprocess
+import threading
 from collections.abc import Callable, Collection, Iterable
+from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, TypedDict, cast
+from tempfile import TemporaryFile
+from typing import IO, TYPE_CHECKING, TypedDict, cast
 
 from license_expression import ExpressionError
 
@@ -23,14 +26,15 @@ from go_vendor_tools.exceptions import LicenseError
 from ..config.licenses import LicenseConfig
 from ..licensing import combine_licenses
 from .base import (
+    ContentDeduplicator,
+    DetectorInputs,
     LicenseData,
     LicenseDetector,
     LicenseDetectorNotAvailableError,
     get_manual_license_entries,
-    is_unwanted_path,
     reuse_path_to_license_map,
 )
-from .search import find_license_files
+from .search import group_license_files, split_license_files
 
 if TYPE_CHECKING:
     from _typeshed import StrPath
@@ -83,10 +87,41 @@ def _filter_path(data: AskalonoLicenseDict) -> AskalonoLicenseDict:
     return data
 
 
+def _write_lines(
+    stream: IO[str], lines: Iterable[StrPath], errors: list[BaseException]
+) -> None:
+    try:
+        for line in lines:
+            stream.write(f"{line}\n")
+            # Let askalono start working on the file right away
+            stream.flush()
+    except BrokenPipeError:
+        # askalono exited early. This is reported by the caller.
+        pass
+    except BaseException as exc:
+        errors.append(exc)
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
 def _get_askalono_data(
-    directory: StrPath, relpaths: Iterable[StrPath], multiple: bool = False
+    directory: StrPath,
+    relpaths: Iterable[StrPath],
+    multiple: bool = False,
+    dedup: ContentDeduplicator[str] | None = None,
 ) -> list[AskalonoLicenseDict]:
-    stdin = "\n".join(map(str, relpaths))
+    """
+    Run askalono on a list of files.
+
+    `relpaths` is consumed in a separate thread that writes the paths to
+    askalono's stdin as they come in, so it can be a generator that's still
+    walking the tree while askalono identifies the files it already received.
+    Only one file per group of byte-identical files is passed to askalono.
+    Pass a `dedup` object to use a DetectionCache.
+    """
     cmd = [
         "askalono",
         "--format",
@@ -98,17 +133,44 @@ def _get_askalono_data(
     # gate this behind a flag
     if multiple:
         cmd.append("--multiple")
-    licenses_json = subprocess.run(
-        cmd,
-        input=stdin,
-        check=True,
-        capture_output=True,
-        text=True,
-        cwd=directory,
-    ).stdout
+    errors: list[BaseException] = []
+    if dedup is None:
+        dedup = ContentDeduplicator(directory)
+    with TemporaryFile() as stderr:
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+            cwd=directory,
+        ) as proc:
+            writer = threading.Thread(
+                target=_write_lines,
+                args=(proc.stdin, dedup.unique(map(str, relpaths)), errors),
+                daemon=True,
+            )
+            writer.start()
+            licenses_json = cast(IO[str], proc.stdout).read()
+            writer.join()
+            returncode = proc.wait()
+        if errors:
+            raise errors[0]
+        if returncode:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode,
+                cmd,
+                licenses_json,
+                stderr.read().decode("utf-8", errors="replace"),
+            )
+    unique_licenses: dict[str, AskalonoLicenseDict] = {}
+    for line in licenses_json.splitlines():
+        data = _filter_path(cast(AskalonoLicenseDict, json.loads(line)))
+        unique_licenses[data["path"]] = data
     licenses = [
-        _filter_path(cast(AskalonoLicenseDict, json.loads(line)))
-        for line in sorted(licenses_json.splitlines())
+        cast(AskalonoLicenseDict, {**data, "path": path})
+        for path, data in dedup.fan_out(unique_licenses).items()
     ]
     licenses.sort(key=lambda ld: ld.get("path", ""))
     return licenses
@@ -194,6 +256,7 @@ class AskalonoLicenseData(LicenseData):
 
 class AskalonoLicenseDetector(LicenseDetector[AskalonoLicenseData]):
     NAME = "askalono"
+    LICENSE_DATA_CLASS = AskalonoLicenseData
     PACKAGES_NEEDED = ("askalono-cli",)
 
     def __init__(
@@ -222,8 +285,29 @@ class AskalonoLicenseDetector(LicenseDetector[AskalonoLicenseData]):
         self.detector_config = detector_config
         self.license_config = license_config
 
+    @property
+    def _multiple(self) -> bool:
+        return str_to_bool(
+            self.detector_config.get("multiple"), CONFIG_MULTIPLE_DEFAULT
+        )
+
+    @cached_property
+    def _version(self) -> str:
+        return subprocess.run(
+            [self.path, "--version"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+
+    def get_detector_version(self) -> str:
+        return self._version
+
     def detect(
-        self, directory: StrPath, reuse_roots: Collection[StrPath] = ()
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = (),
+        inputs: DetectorInputs | None = None,
     ) -> AskalonoLicenseData:
         if self.find_only:
             raise ValueError(
@@ -232,17 +316,17 @@ class AskalonoLicenseDetector(LicenseDetector[AskalonoLicenseData]):
         gitignore = Path(directory, ".gitignore")
         if gitignore.is_file():
             _remove_line(gitignore, lambda line: line.startswith("vendor"))
-        license_file_lists = find_license_files(
-            directory=directory,
-            relative_paths=True,
-            exclude_directories=self.license_config["exclude_directories"],
-            exclude_files=self.license_config["exclude_files"],
-            reuse_roots=reuse_roots,
-        )
+        license_file_lists = group_license_files(())
+        # askalono starts identifying license files while the tree is walked
+        multiple = self._multiple
         askalono_license_data = _get_askalono_data(
             directory,
-            license_file_lists["license"],
-            str_to_bool(self.detector_config.get("multiple"), CONFIG_MULTIPLE_DEFAULT),
+            split_license_files(
+                self._iter_input_license_files(directory, reuse_roots, inputs),
+                license_file_lists,
+            ),
+            multiple,
+            self._get_content_deduplicator(directory, multiple=multiple),
         )
         filtered_license_data, undetected = _filter_license_data(
             askalono_license_data, Path(directory)
@@ -258,15 +342,7 @@ class AskalonoLicenseDetector(LicenseDetector[AskalonoLicenseData]):
         license_map = dict(sorted(license_map.items(), key=lambda item: item[0]))
         # Remove manually specified licenses
         undetected -= set(manual_license_map)
-        undetected = {
-            path
-            for path in undetected
-            if not is_unwanted_path(
-                path,
-                self.license_config["exclude_directories"],
-                self.license_config["exclude_files"],
-            )
-        }
+        undetected = {path for path in undetected if not self.exclusion_matcher(path)}
         undetected -= set(manual_license_map)
         return AskalonoLicenseData(
             directory=Path(directory),
@@ -285,10 +361,13 @@ class AskalonoLicenseDetector(LicenseDetector[AskalonoLicenseData]):
             raise ValueError(
                 "This cannot be called when class was initalized with find_only=True"
             )
+        base_directory = directory if directory is not None else Path("/")
+        multiple = self._multiple
         askalono_license_data = _get_askalono_data(
-            directory if directory is not None else "/",
+            base_directory,
             files,
-            str_to_bool(self.detector_config.get("multiple"), CONFIG_MULTIPLE_DEFAULT),
+            multiple,
+            self._get_content_deduplicator(base_directory, multiple=multiple),
         )
         filtered_license_data, undetected = _filter_license_data(
             askalono_license_data, directory
@@ -8,21 +8,49 @@ Base classes for handling license detection tools
 from __future__ import annotations
 
 import abc
+import contextlib
 import dataclasses
 import os
 import re
 import sys
-from collections.abc import Collection, Iterable, Mapping, Sequence
-from functools import partial
+import threading
+from collections.abc import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    Set,
+)
+from functools import cached_property, partial
 from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar, Generic
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, NamedTuple, TextIO, cast
 
 from go_vendor_tools.config.licenses import LicenseConfig, LicenseEntry
 from go_vendor_tools.exceptions import LicenseError
-from go_vendor_tools.hashing import verify_hash
-from go_vendor_tools.license_detection.search import find_license_files
-from go_vendor_tools.licensing import combine_licenses, get_unknown_license_keys
+from go_vendor_tools.hashing import get_hash, get_hashes, verify_hashes
+from go_vendor_tools.license_detection import jsonstream
+from go_vendor_tools.license_detection.cache import (
+    DetectionCache,
+    get_cache_namespace,
+)
+from go_vendor_tools.license_detection.jsonstream import JSONObject
+from go_vendor_tools.license_detection.pathtable import (
+    PathMap,
+    PathSequence,
+    PathSet,
+    get_path_table,
+)
+from go_vendor_tools.license_detection.search import (
+    DEFAULT_FILE_TYPES,
+    LicenseRegexFileType,
+    compile_exclude_globs,
+    group_license_files,
+    iter_license_files,
+)
+from go_vendor_tools.licensing import LicenseAccumulator, get_unknown_license_keys
 
 if TYPE_CHECKING:
     from _typeshed import StrPath
@@ -37,13 +65,103 @@ EXTRA_LICENSE_FILE_REGEX = re.compile(
 )
 
 
+class FileHashStore:
+    """
+    Per-run store of license files' sha256 hashes.
+
+    Each file is hashed once and its hash is shared by every stage of the
+    run that needs it (content deduplication, manual license entry
+    verification, license data fingerprints, etc.).
+
+    When a HashMemo is active (see `go_vendor_tools.hashing.hash_memo()`),
+    `get_hash()` uses it instead of reading the file.
+
+    The store assumes that files are not modified during the run.
+    It is safe to use from multiple threads.
+    """
+
+    def __init__(self) -> None:
+        self._digests: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get_hash(self, path: StrPath) -> str:
+        """
+        Return the hex sha256 digest of `path`'s contents
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = get_hash(Path(path))
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def get_hashes(
+        self, files: Iterable[Path], jobs: int | None = None
+    ) -> dict[Path, str | None]:
+        """
+        Like `go_vendor_tools.hashing.get_hashes()`
+        """
+        return get_hashes(files, jobs, self.get_hash)
+
+    def verify_hashes(
+        self, entries: Iterable[tuple[Path, str]], jobs: int | None = None
+    ) -> list[bool]:
+        """
+        Like `go_vendor_tools.hashing.verify_hashes()`
+        """
+        return verify_hashes(entries, jobs, self.get_hash)
+
+    def __contains__(self, path: StrPath) -> bool:
+        """
+        Whether `path`'s hash is stored
+        """
+        with self._lock:
+            return os.path.abspath(path) in self._digests
+
+
+_file_store: FileHashStore | None = None
+
+
+@contextlib.contextmanager
+def file_hash_store(
+    store: FileHashStore | None = None,
+) -> Iterator[FileHashStore]:
+    """
+    Make `store` (or a new FileHashStore) the store returned by
+    `get_file_hash_store()` within the context.
+    The store's hashes are released on exit.
+    """
+    global _file_store  # noqa: PLW0603
+    store = FileHashStore() if store is None else store
+    old, _file_store = _file_store, store
+    try:
+        yield store
+    finally:
+        _file_store = old
+
+
+def get_file_hash_store() -> FileHashStore:
+    """
+    Returns:
+        The store activated by `file_hash_store()` or a new store that's
+        not shared with other callers
+    """
+    return _file_store if _file_store is not None else FileHashStore()
+
+
 def get_manual_license_entries(
     licenses: list[LicenseEntry], directory: StrPath
 ) -> tuple[dict[Path, str], tuple[Path, ...]]:
     results: dict[Path, str] = {}
     not_matched: list[Path] = []
     seen: set[Path] = set()
-    for lic in licenses:
+    # Verify all of the hashes up front on a thread pool
+    verified = get_file_hash_store().verify_hashes(
+        (directory / Path(lic["path"]), lic["sha256sum"]) for lic in licenses
+    )
+    for lic, is_verified in zip(licenses, verified):
         relpath = Path(lic["path"])
         path = directory / relpath
         if path in results:
@@ -51,7 +169,7 @@ def get_manual_license_entries(
                 f"{path} was specified multiple times in the configuration!"
             )
         seen.add(path)
-        if verify_hash(path, lic["sha256sum"]):
+        if is_verified:
             results[relpath] = lic["expression"]
         else:
             not_matched.append(relpath)
@@ -63,29 +181,88 @@ def is_unwanted_path(
     exclude_directories: Collection[StrPath],
     exclude_files: Collection[str],
 ) -> bool:
-    return (
-        # Hardcoded exception
-        "testdata" in path.parts
-        or str(path) in exclude_files
-        or any(path.is_relative_to(directory) for directory in exclude_directories)
-    )
+    """
+    Check whether a license file should be ignored.
+    Use an `ExclusionMatcher` to check many paths against the same settings.
+    """
+    return ExclusionMatcher(exclude_directories, exclude_files)(path)
+
+
+class ExclusionMatcher:
+    """
+    Check whether license files should be ignored.
+
+    The excluded directories are stored in a prefix trie of path components,
+    so checking a path costs O(path depth) instead of
+    O(number of excluded directories).
+    """
+
+    # Marks a trie node that corresponds to an excluded directory
+    _TERMINAL = ""
+    # Hardcoded exception
+    _EXCLUDED_NAMES = frozenset({"testdata"})
+
+    def __init__(
+        self,
+        exclude_directories: Collection[StrPath] = (),
+        exclude_files: Collection[str] = (),
+        exclude_globs: Collection[str] = (),
+    ) -> None:
+        self._exclude_glob = compile_exclude_globs(exclude_globs)
+        self._trie: dict[str, Any] = {}
+        for directory in exclude_directories:
+            node = self._trie
+            for part in Path(directory).parts:
+                node = node.setdefault(part, {})
+            node[self._TERMINAL] = True
+        self._exclude_files = frozenset(exclude_files)
+
+    @classmethod
+    def from_license_config(cls, config: LicenseConfig) -> Self:
+        return cls(
+            config["exclude_directories"],
+            config["exclude_files"],
+            config["exclude_globs"],
+        )
+
+    def __call__(self, path: Path) -> bool:
+        """
+        Check whether a license file should be ignored
+        """
+        parts = path.parts
+        if not self._EXCLUDED_NAMES.isdisjoint(parts):
+            return True
+        if str(path) in self._exclude_files:
+            return True
+        if self._exclude_glob:
+            # Globs are matched against the path and each of its parents
+            parent = ""
+            for part in parts:
+                parent = os.path.join(parent, part)
+                if self._exclude_glob.match(parent):
+                    return True
+        node = self._trie
+        for part in parts:
+            if self._TERMINAL in node:
+                return True
+            child = node.get(part)
+            if child is None:
+                return False
+            node = child
+        return self._TERMINAL in node
 
 
 def filter_license_map(
     license_map: dict[Path, str],
     exclude_directories: Collection[str],
     exclude_files: Collection[str],
+    exclude_globs: Collection[str] = (),
 ) -> dict[Path, str]:
     """
     Filter licenses files from unwanted paths
     """
-    exclude_directories = set(exclude_directories)
-    exclude_files = set(exclude_files)
-    return {
-        path: exp
-        for path, exp in license_map.items()
-        if not is_unwanted_path(path, exclude_directories, exclude_files)
-    }
+    is_excluded = ExclusionMatcher(exclude_directories, exclude_files, exclude_globs)
+    return {path: exp for path, exp in license_map.items() if not is_excluded(path)}
 
 
 def python3dist(package: str, /) -> str:
@@ -102,14 +279,121 @@ def reuse_path_to_license_map(files: Collection[StrPath]) -> dict[Path, str]:
     return result
 
 
+_PathT = TypeVar("_PathT", str, Path)
+_T = TypeVar("_T")
+
+
+class ContentDeduplicator(Generic[_PathT]):
+    """
+    Group license files by the sha256 hash of their contents.
+
+    Vendor trees contain many byte-identical copies of the same license texts,
+    so detector backends only need to analyze one representative file per
+    group.
+    Pass the candidate files to the backend through `unique()` and then use
+    `fan_out()` to map the backend's result for each representative back to
+    every file in its group.
+
+    When a `DetectionCache` is passed, groups with a cached result are not
+    passed to the backend at all and `fan_out()` stores the backend's new
+    results in the cache.
+    The results must be JSON serializable.
+
+    Attributes:
+        directory: Base directory for relative paths
+        store:
+            FileHashStore used to hash the files.
+            Defaults to `get_file_hash_store()`.
+        cache: DetectionCache or None
+        cache_namespace: Namespace from `get_cache_namespace()`
+        representatives:
+            Mapping of each file passed to `unique()` to the representative
+            of its group
+    """
+
+    def __init__(
+        self,
+        directory: StrPath | None = None,
+        cache: DetectionCache | None = None,
+        cache_namespace: str = "",
+        store: FileHashStore | None = None,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.store = get_file_hash_store() if store is None else store
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+        self.representatives: dict[_PathT, _PathT] = {}
+        self._by_hash: dict[str, _PathT] = {}
+        # Representatives that were passed to the backend to their hashes
+        self._digests: dict[_PathT, str] = {}
+        self._cached: dict[_PathT, Any] = {}
+
+    def unique(self, files: Iterable[_PathT]) -> Iterator[_PathT]:
+        """
+        Yield the first file of each group of files with the same contents
+        that doesn't already have a cached result.
+        `files` is consumed lazily, so it can still be streaming in from the
+        tree walk.
+        """
+        for file in files:
+            if file in self.representatives:
+                continue
+            path = self.directory / file if self.directory else Path(file)
+            try:
+                digest = self.store.get_hash(path)
+            except OSError:
+                # Let the backend report the error
+                self.representatives[file] = file
+                yield file
+                continue
+            representative = self._by_hash.setdefault(digest, file)
+            self.representatives[file] = representative
+            if representative != file:
+                continue
+            if (
+                self.cache is not None
+                and (cached := self.cache.get(self.cache_namespace, digest)) is not None
+            ):
+                self._cached[file] = cached
+                continue
+            self._digests[file] = digest
+            yield file
+
+    def fan_out(self, results: Mapping[_PathT, _T]) -> dict[_PathT, _T]:
+        """
+        Map each file passed to `unique()` to the result for its group's
+        representative, preserving the original order of the files
+        """
+        if self.cache is not None:
+            self.cache.put_many(
+                self.cache_namespace,
+                (
+                    (self._digests[file], result)
+                    for file, result in results.items()
+                    if file in self._digests
+                ),
+            )
+            results = {**self._cached, **results}
+        return {
+            file: results[representative]
+            for file, representative in self.representatives.items()
+            if representative in results
+        }
+
+
 @dataclasses.dataclass(frozen=True)
 class LicenseData:
     """
     Generic class representing detected license data.
     Can be subclassed by detector implementations to add additional fields.
-    Attributes marked with (Generated fields) are calculated during class init
-    and are not passed as values.
+    Attributes marked with (Generated fields) are not passed as values.
+    They are calculated on first access and cached on the instance.
     The class is a frozen dataclass and is meant to be (pseudo) immutable.
+    Use `replace()` to create modified copies; it reuses the generated fields
+    that were already calculated when their inputs did not change.
+    The paths in `license_map`, `undetected_licenses`, and
+    `license_file_paths` are stored in a shared `PathTable` to keep memory
+    usage low on large vendor trees.
 
     Attributes:
         directory:
@@ -144,7 +428,7 @@ class LicenseData:
 
     directory: Path
     license_map: Mapping[Path, str]
-    undetected_licenses: frozenset[Path]
+    undetected_licenses: Set[Path]
     unmatched_manual_licenses: tuple[Path, ...]
     extra_license_files: tuple[Path, ...]
     detector_name: str
@@ -152,7 +436,7 @@ class LicenseData:
     # Generated fields
     license_set: frozenset[str] = dataclasses.field(init=False, compare=False)
     license_expression: str = dataclasses.field(init=False, compare=False)
-    license_file_paths: tuple[Path, ...] = dataclasses.field(init=False, compare=False)
+    license_file_paths: Sequence[Path] = dataclasses.field(init=False, compare=False)
     unknown_license_keys: list[str] = dataclasses.field(init=False, compare=False)
     is_valid_license: bool = dataclasses.field(init=False, compare=False)
 
@@ -164,55 +448,145 @@ class LicenseData:
         "extra_license_files",
     )
 
-    # Implement replace() method
-    replace = dataclasses.replace
-
     def __post_init__(self) -> None:
+        table = get_path_table(self.license_map, self.undetected_licenses)
+        if not (
+            isinstance(self.license_map, PathMap) and self.license_map.table is table
+        ):
+            object.__setattr__(self, "license_map", PathMap(self.license_map, table))
+        if not (
+            isinstance(self.undetected_licenses, PathSet)
+            and self.undetected_licenses.table is table
+        ):
+            object.__setattr__(
+                self, "undetected_licenses", PathSet(self.undetected_licenses, table)
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        # Generated fields are computed on first access.
+        # This is only called when the attribute isn't set yet.
+        try:
+            compute = self._GENERATED_FIELDS[name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+        value = compute(self)
         # Use object.__setattr__ because this is a frozen dataclass.
-        object.__setattr__(self, "license_set", frozenset(self.license_map.values()))
-        object.__setattr__(
-            self,
-            "license_expression",
-            self._combine_licenses(*self.license_set) if self.license_map else None,
+        object.__setattr__(self, name, value)
+        return value
+
+    def _get_license_set(self) -> frozenset[str]:
+        return frozenset(self.license_map.values())
+
+    def _get_license_expression(self) -> str | None:
+        if not self.license_map:
+            return None
+        # Matches combine_licenses(), which returns "None" when all of the
+        # expressions are empty
+        return str(self._new_license_accumulator(self.license_set))
+
+    def _get_license_file_paths(self) -> PathSequence:
+        license_map = cast(PathMap, self.license_map)
+        undetected_licenses = cast(PathSet, self.undetected_licenses)
+        directory_parts = self.directory.parts
+
+        # Sort in the same order as the joined Paths without creating them
+        def key(parts: tuple[str, ...]) -> tuple[str, ...]:
+            return parts if parts[:1] == ("/",) else directory_parts + parts
+
+        return PathSequence(
+            self.directory,
+            sorted(chain(license_map.parts(), undetected_licenses.parts()), key=key),
+            license_map.table,
         )
-        object.__setattr__(
-            self,
-            "license_file_paths",
-            tuple(
-                sorted(
-                    self.directory / lic
-                    for lic in chain(self.license_map, self.undetected_licenses)
-                ),
-            ),
-        )
-        object.__setattr__(
-            self,
-            "unknown_license_keys",
-            get_unknown_license_keys(self.license_expression),
-        )
-        object.__setattr__(self, "is_valid_license", not self.unknown_license_keys)
 
-    _combine_licenses = staticmethod(
-        partial(combine_licenses, validate=False, strict=False)
+    def _get_unknown_license_keys(self) -> list[str]:
+        return get_unknown_license_keys(self.license_expression)
+
+    def _get_is_valid_license(self) -> bool:
+        return not self.unknown_license_keys
+
+    _GENERATED_FIELDS: ClassVar[dict[str, Callable[[LicenseData], Any]]] = {
+        "license_set": _get_license_set,
+        "license_expression": _get_license_expression,
+        "license_file_paths": _get_license_file_paths,
+        "unknown_license_keys": _get_unknown_license_keys,
+        "is_valid_license": _get_is_valid_license,
+    }
+
+    def replace(self, **changes: Any) -> Self:
+        """
+        Return a copy with `changes` applied like `dataclasses.replace()`.
+        Generated fields that were already computed are reused when the fields
+        they are derived from did not change.
+        """
+        new = dataclasses.replace(self, **changes)
+        computed = self.__dict__
+
+        def share(*names: str) -> None:
+            for name in names:
+                if name in computed:
+                    object.__setattr__(new, name, computed[name])
+
+        if (
+            new.directory == self.directory
+            and cast(PathMap, new.license_map).parts()
+            == cast(PathMap, self.license_map).parts()
+            and new.undetected_licenses == self.undetected_licenses
+        ):
+            share("license_file_paths")
+        # The expression only depends on the set of unique expressions, so it
+        # can be reused even if files were added or removed
+        if "license_set" in computed and new.license_set == self.license_set:
+            share("license_expression", "unknown_license_keys", "is_valid_license")
+        return new
+
+    _new_license_accumulator = staticmethod(
+        partial(LicenseAccumulator, validate=False, strict=False)
     )
 
     # This would be a good task for pydantic, but we want to keep dependencies slim.
-    def to_jsonable(self) -> dict[str, Any]:
-        data = dataclasses.asdict(self)
-        for key, value in data.items():
+    def _iter_jsonable(self) -> Iterator[tuple[str, Any]]:
+        # Values are converted lazily. See the jsonstream module.
+        for field in dataclasses.fields(self):
+            key = field.name
+            value = getattr(self, key)
             if key == "directory":
-                data[key] = str(value)
+                value = str(value)
             elif key == "license_map":
-                data[key] = {str(key1): value1 for key1, value1 in value.items()}
+                value = JSONObject((str(path), expr) for path, expr in value.items())
             elif key in self._LIST_PATH_FIELDS:
-                data[key] = list(map(str, value))
-                if not isinstance(value, Sequence):
-                    data[key].sort()
+                value = (
+                    map(str, value)
+                    if isinstance(value, Sequence)
+                    else iter(sorted(map(str, value)))
+                )
             elif key == "license_set":
-                data[key] = sorted(value)
+                value = iter(sorted(value))
             elif key == "license_expression":
-                data[key] = str(value)
-        return data
+                value = str(value)
+            yield key, value
+
+    def to_jsonable(self) -> dict[str, Any]:
+        return jsonstream.to_jsonable(JSONObject(self._iter_jsonable()))
+
+    def write_json(self, fp: TextIO, extra: Mapping[str, Any] | None = None) -> None:
+        """
+        Write the `to_jsonable()` data to `fp` as JSON with an indent of 2.
+        The data is written field by field and entry by entry instead of
+        building and copying the whole `to_jsonable()` dict first.
+
+        Args:
+            fp: Text file
+            extra:
+                Additional JSON-serializable fields to write after the
+                LicenseData fields. `from_jsonable()` ignores them.
+        """
+        fields = self._iter_jsonable()
+        if extra:
+            fields = chain(fields, extra.items())
+        jsonstream.dump(JSONObject(fields), fp)
 
     @classmethod
     def _from_jsonable_to_dict(cls, data: dict[Any, Any]) -> dict[Any, Any]:
@@ -237,6 +611,31 @@ class LicenseData:
         return cls(**cls._from_jsonable_to_dict(data))
 
 
+class DetectorInputs(NamedTuple):
+    """
+    Inputs of `LicenseDetector.detect()` found by
+    `LicenseDetector.scan_inputs()`
+
+    Attributes:
+        license_file_lists:
+            Mapping of file type names (and "reuse") to sorted lists of
+            license file paths relative to the directory
+        fingerprint: Hash of the inputs
+    """
+
+    license_file_lists: dict[str, list[str]]
+    fingerprint: str
+
+    def iter_license_files(self) -> Iterator[tuple[str, str]]:
+        """
+        Yields:
+            (file type name or "reuse", path) like `iter_license_files()`
+        """
+        for filetype, paths in self.license_file_lists.items():
+            for path in paths:
+                yield filetype, path
+
+
 if TYPE_CHECKING:
     _LicenseDataT_co = TypeVar(
         "_LicenseDataT_co", bound=LicenseData, covariant=True, default=LicenseData
@@ -255,19 +654,26 @@ class LicenseDetector(Generic[_LicenseDataT_co], metaclass=abc.ABCMeta):
             Tuple of Fedora package names needed for the license detector
         FIND_PACKAGES_NEEDED:
             Tuple of packages needed for find_only mode (see __init__ docstring)
+        LICENSE_DATA_CLASS:
+            LicenseData subclass returned by detect()
         license_config:
             LicenseConfig object passed to the constructor
         detector_config:
             Options passeed to constructor
         find_only: Whether find_only mode is enabled
+        cache:
+            Persistent DetectionCache for per-file results or None to disable
+            caching
     """
 
     NAME: ClassVar[str]
     PACKAGES_NEEDED: ClassVar[tuple[str, ...]] = ()
     FIND_PACKAGES_NEEDED: ClassVar[tuple[str, ...]] = ()
+    LICENSE_DATA_CLASS: ClassVar[type[LicenseData]] = LicenseData
     detector_config: dict[str, str]
     license_config: LicenseConfig
     _find_only: bool
+    cache: DetectionCache | None = None
 
     @abc.abstractmethod
     def __init__(
@@ -293,6 +699,105 @@ class LicenseDetector(Generic[_LicenseDataT_co], metaclass=abc.ABCMeta):
                 required.
         """
 
+    def get_detector_version(self) -> str:
+        """
+        Version of the backend used to namespace cached results
+        """
+        return ""
+
+    def scan_inputs(
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = (),
+        extra_files: Collection[StrPath] = (),
+    ) -> DetectorInputs | None:
+        """
+        Find the license files that `detect()` reads and fingerprint the
+        inputs of `detect()`: the detector, its options, the license config,
+        and the paths and contents of the license files.
+        The location of `directory` is not included.
+        Pass the result to `detect()` so it doesn't need to search the tree
+        again.
+
+        Args:
+            directory: Directory
+            reuse_roots: Directories to search for REUSE-style LICENSES directory
+            extra_files:
+                Other files relative to `directory` whose contents are
+                included in the fingerprint
+
+        Returns:
+            The DetectorInputs or None if the inputs cannot be determined
+            without running the backend
+        """
+        license_file_lists = self._find_license_file_lists(directory, reuse_roots)
+        manual_license_map, unmatched = get_manual_license_entries(
+            self.license_config["licenses"], directory
+        )
+        files = sorted(
+            {
+                *chain.from_iterable(license_file_lists.values()),
+                *map(str, manual_license_map),
+            }
+        )
+        extra_files = list(map(str, extra_files))
+        hashes = get_file_hash_store().get_hashes(
+            Path(directory, file) for file in (*files, *extra_files)
+        )
+        fingerprint = get_cache_namespace(
+            self.NAME,
+            self.get_detector_version(),
+            self.detector_config,
+            # search_jobs comes from the environment and doesn't affect the
+            # results
+            {
+                key: value
+                for key, value in self.license_config.items()
+                if key != "search_jobs"
+            },
+            license_file_lists,
+            list(map(str, unmatched)),
+            [(file, hashes[Path(directory, file)]) for file in files],
+            [(file, hashes[Path(directory, file)]) for file in extra_files],
+        )
+        return DetectorInputs(license_file_lists, fingerprint)
+
+    def _iter_input_license_files(
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath],
+        inputs: DetectorInputs | None,
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Like `_iter_license_files()`, but use the files found by
+        `scan_inputs()` when `inputs` is passed
+        """
+        if inputs is None:
+            return self._iter_license_files(directory, reuse_roots)
+        return inputs.iter_license_files()
+
+    def _get_content_deduplicator(
+        self, directory: StrPath | None, **options: object
+    ) -> ContentDeduplicator[Any]:
+        """
+        Create a ContentDeduplicator that uses the detector's cache (if any)
+
+        Args:
+            directory: Base directory for relative paths
+            options: Detector options that affect the results
+        """
+        if self.cache is None:
+            return ContentDeduplicator(directory)
+        namespace = get_cache_namespace(self.NAME, self.get_detector_version(), options)
+        return ContentDeduplicator(directory, self.cache, namespace)
+
+    @cached_property
+    def exclusion_matcher(self) -> ExclusionMatcher:
+        """
+        ExclusionMatcher for the license_config's exclusion settings
+        """
+        return ExclusionMatcher.from_license_config(self.license_config)
+
     @property
     def find_only(self):
         """
@@ -302,7 +807,10 @@ class LicenseDetector(Generic[_LicenseDataT_co], metaclass=abc.ABCMeta):
 
     @abc.abstractmethod
     def detect(
-        self, directory: StrPath, reuse_roots: Collection[StrPath] = ...
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = ...,
+        inputs: DetectorInputs | None = ...,
     ) -> _LicenseDataT_co:
         """
         Scan a directory for license data
@@ -310,6 +818,9 @@ class LicenseDetector(Generic[_LicenseDataT_co], metaclass=abc.ABCMeta):
         Args:
             directory: Directory
             reuse_roots: Directories to search for REUSE-style LICENSES directory
+            inputs:
+                Result of `scan_inputs()` for the same directory and
+                reuse_roots or None to search the tree
         """
 
     @abc.abstractmethod
@@ -328,6 +839,57 @@ class LicenseDetector(Generic[_LicenseDataT_co], metaclass=abc.ABCMeta):
         Returns: (License mapping, undetected files)
         """
 
+    def _iter_license_files(
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = (),
+        filetype_info: Sequence[LicenseRegexFileType] = DEFAULT_FILE_TYPES,
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Run `search.iter_license_files()` with the settings from license_config
+
+        Args:
+            directory: Directory
+            reuse_roots:
+                Directories to search for REUSE-style LICENSES directory.
+                These are the vendored Go module directories, so they are also
+                used as the module roots to walk separately (and concurrently
+                when licensing.search_jobs is greater than 1) and to limit the
+                search when licensing.search_mode is "modules".
+            filetype_info: License file types to search for
+
+        Yields:
+            (file type name or "reuse", path relative to `directory`)
+        """
+        return iter_license_files(
+            directory,
+            relative_paths=True,
+            exclude_directories=self.license_config["exclude_directories"],
+            exclude_files=self.license_config["exclude_files"],
+            reuse_roots=reuse_roots,
+            filetype_info=filetype_info,
+            module_roots=reuse_roots,
+            modules_only=self.license_config["search_mode"] == "modules",
+            max_depth=self.license_config["search_max_depth"],
+            jobs=self.license_config["search_jobs"],
+            exclude_globs=self.license_config["exclude_globs"],
+        )
+
+    def _find_license_file_lists(
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = (),
+        filetype_info: Sequence[LicenseRegexFileType] = DEFAULT_FILE_TYPES,
+    ) -> dict[str, list[str]]:
+        """
+        Like `_iter_license_files()`, but return a mapping of file type names
+        (and "reuse") to sorted lists of paths
+        """
+        return group_license_files(
+            self._iter_license_files(directory, reuse_roots, filetype_info),
+            filetype_info,
+        )
+
     def find_license_files(
         self, directory: StrPath, reuse_roots: Collection[StrPath] = ()
     ) -> list[Path]:
@@ -341,13 +903,7 @@ class LicenseDetector(Generic[_LicenseDataT_co], metaclass=abc.ABCMeta):
             LicenseError:
                 Invalid manual license config entries are present in the license config
         """
-        license_file_lists = find_license_files(
-            directory,
-            relative_paths=True,
-            exclude_directories=self.license_config["exclude_directories"],
-            exclude_files=self.license_config["exclude_files"],
-            reuse_roots=reuse_roots,
-        )
+        license_file_lists = self._find_license_file_lists(directory, reuse_roots)
         manual_license_map, unmatched = get_manual_license_entries(
             self.license_config["licenses"], directory
         )
@@ -0,0 +1,199 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Persistent caches for per-file license detection results and whole-package
+license data
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from go_vendor_tools.config.utils import get_user_cache_dir
+
+if TYPE_CHECKING:
+    from _typeshed import StrPath
+    from typing_extensions import Self
+
+DEFAULT_CACHE_MAX_SIZE = 64 * 1024 * 1024
+CACHE_FILE_NAME = "license-detection.sqlite3"
+# Whole-package license data is much larger than per-file results, so it gets
+# its own file and size budget and cannot evict them.
+DEFAULT_LICENSE_DATA_CACHE_MAX_SIZE = 64 * 1024 * 1024
+LICENSE_DATA_CACHE_FILE_NAME = "license-data.sqlite3"
+# Seconds to wait for other processes to release the database lock
+_LOCK_TIMEOUT = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    atime REAL NOT NULL,
+    PRIMARY KEY (namespace, digest)
+);
+CREATE INDEX IF NOT EXISTS results_atime ON results (atime);
+"""
+
+
+def get_default_cache_path(file_name: str = CACHE_FILE_NAME) -> Path:
+    return get_user_cache_dir() / file_name
+
+
+def get_cache_namespace(*parts: object) -> str:
+    """
+    Hash the parts of a cache key that aren't the file's hash (detector name,
+    detector version, detector options, etc.) into a namespace string.
+    `parts` must be JSON serializable.
+    """
+    data = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class DetectionCache:
+    """
+    sqlite3-backed cache of raw license detector results.
+
+    Results are keyed by a namespace from `get_cache_namespace()` and the
+    sha256 hash of the license file's contents, so they are shared by all
+    copies of a license text across runs and packages.
+    Once the stored results exceed `max_size` bytes, the least recently used
+    entries are evicted.
+    sqlite handles locking, so multiple processes can use the same cache file
+    concurrently.
+    The cache is best-effort: database errors after the cache is opened are
+    treated as cache misses.
+    Whole-package license data is memoized in a separate DetectionCache
+    (`LICENSE_DATA_CACHE_FILE_NAME`).
+    """
+
+    def __init__(self, path: StrPath, max_size: int = DEFAULT_CACHE_MAX_SIZE) -> None:
+        self.path = Path(path)
+        self.max_size = max_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The connection is shared with the threads that feed files to the
+        # detector backends
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=_LOCK_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            with self._transaction():
+                for statement in _SCHEMA.split(";"):
+                    self._conn.execute(statement)
+        except BaseException:
+            self._conn.close()
+            raise
+        # Hits whose access times still need to be updated
+        self._hits: list[tuple[str, str]] = []
+
+    @classmethod
+    def open_default(
+        cls,
+        file_name: str = CACHE_FILE_NAME,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ) -> Self:
+        return cls(get_default_cache_path(file_name), max_size)
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def get(self, namespace: str, digest: str) -> Any | None:
+        """
+        Returns:
+            The cached result or None
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM results WHERE namespace = ? AND digest = ?",
+                    (namespace, digest),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None:
+                return None
+            self._hits.append((namespace, digest))
+        return json.loads(row[0])
+
+    def put_many(self, namespace: str, items: Iterable[tuple[str, Any]]) -> None:
+        """
+        Store (digest, result) pairs, update the access times of the entries
+        returned by `get()`, and evict old entries if needed.
+        `result`s must be JSON serializable.
+        """
+        now = time.time()
+        rows = []
+        for digest, result in items:
+            # Results are returned exactly as they were stored
+            value = json.dumps(result)
+            rows.append((namespace, digest, value, len(value), now))
+        with self._lock:
+            hits, self._hits = self._hits, []
+            try:
+                with self._transaction():
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows
+                    )
+                    self._conn.executemany(
+                        "UPDATE results SET atime = ?"
+                        " WHERE namespace = ? AND digest = ?",
+                        ((now, *hit) for hit in hits),
+                    )
+                    self._evict()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+        # Evict down to 90% of max_size so we don't have to evict again on
+        # every run
+        excess = total - self.max_size * 9 // 10
+        evict: list[tuple[int]] = []
+        for rowid, size in self._conn.execute(
+            "SELECT rowid, size FROM results ORDER BY atime"
+        ):
+            if excess <= 0:
+                break
+            evict.append((rowid,))
+            excess -= size
+        self._conn.executemany("DELETE FROM results WHERE rowid = ?", evict)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
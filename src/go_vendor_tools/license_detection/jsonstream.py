@@ -0,0 +1,88 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Write JSON incrementally without building the whole document in memory first
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from collections.abc import Iterable, Iterator
+from json.encoder import encode_basestring_ascii
+from typing import Any, NamedTuple, TextIO
+
+
+class JSONObject(NamedTuple):
+    """
+    JSON object whose (key, value) pairs are produced on demand.
+    The values may be JSONObjects, iterators (JSON arrays whose elements are
+    produced on demand), or any value accepted by `json.dump()`.
+    """
+
+    items: Iterable[tuple[str, Any]]
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert JSONObjects and iterators in `value` to dicts and lists.
+    Other values are deep copied.
+    """
+    if isinstance(value, JSONObject):
+        return {key: to_jsonable(item) for key, item in value.items}
+    if isinstance(value, Iterator):
+        return [to_jsonable(item) for item in value]
+    return copy.deepcopy(value)
+
+
+def iterencode(value: Any, indent: int = 2) -> Iterator[str]:
+    """
+    Encode `value` chunk by chunk.
+    The output is the same as `json.dumps(to_jsonable(value), indent=indent)`.
+    """
+    encoder = json.JSONEncoder(indent=indent)
+    indent_str = " " * indent
+
+    def encode(value: Any, level: int) -> Iterator[str]:
+        if isinstance(value, str):
+            yield encode_basestring_ascii(value)
+        elif isinstance(value, JSONObject):
+            yield from encode_items(value.items, level, "{}", True)
+        elif isinstance(value, Iterator):
+            yield from encode_items(value, level, "[]", False)
+        elif not level:
+            yield from encoder.iterencode(value)
+        else:
+            # Strings cannot contain literal newlines, so all newlines are
+            # indentation
+            newline = "\n" + indent_str * level
+            for chunk in encoder.iterencode(value):
+                yield chunk.replace("\n", newline)
+
+    def encode_items(
+        items: Iterable[Any], level: int, brackets: str, is_object: bool
+    ) -> Iterator[str]:
+        separator = brackets[0] + "\n" + indent_str * (level + 1)
+        empty = True
+        for item in items:
+            if is_object:
+                key, item = item
+                yield separator + encode_basestring_ascii(key) + ": "
+            else:
+                yield separator
+            yield from encode(item, level + 1)
+            separator = ",\n" + indent_str * (level + 1)
+            empty = False
+        yield brackets if empty else "\n" + indent_str * level + brackets[1]
+
+    return encode(value, 0)
+
+
+def dump(value: Any, fp: TextIO, indent: int = 2) -> None:
+    """
+    Write `value` to `fp` chunk by chunk.
+    The output is the same as `json.dump(to_jsonable(value), fp, indent=indent)`.
+    """
+    for chunk in iterencode(value, indent):
+        fp.write(chunk)
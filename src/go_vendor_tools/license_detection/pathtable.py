@@ -0,0 +1,239 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Compact storage for the license file paths in LicenseData
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    Mapping,
+    Sequence,
+    Set,
+    ValuesView,
+)
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, overload
+
+if TYPE_CHECKING:
+    from _typeshed import StrPath
+    from typing_extensions import Self
+
+PathParts = tuple[str, ...]
+
+
+class PathTable:
+    """
+    Table of interned path components.
+
+    Paths are stored as tuples of their components (see `PurePath.parts`)
+    instead of Path objects.
+    Each distinct component (e.g., `vendor`, `github.com`, or `LICENSE`) is
+    stored once and shared by all of the paths in the table.
+    Path objects are only created when a path is retrieved.
+    """
+
+    def __init__(self) -> None:
+        self._names: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, path: StrPath) -> PathParts:
+        """
+        Returns:
+            The components of `path` using the table's shared strings
+        """
+        names = self._names
+        return tuple([names.setdefault(name, name) for name in PurePath(path).parts])
+
+
+def get_path_table(*objs: object) -> PathTable:
+    """
+    Returns:
+        The PathTable of the first PathMap, PathSet, or PathSequence in
+        `objs` or a new PathTable
+    """
+    for obj in objs:
+        if isinstance(obj, (PathMap, PathSet, PathSequence)):
+            return obj.table
+    return PathTable()
+
+
+def _get_parts(key: object) -> PathParts | None:
+    # Like dicts and sets of Paths, only Paths are valid keys
+    return key.parts if isinstance(key, PurePath) else None
+
+
+def _to_path(parts: PathParts) -> Path:
+    return Path(*parts)
+
+
+class PathMap(Mapping[Path, str]):
+    """
+    Read-only mapping of paths to strings that stores the paths in a
+    PathTable.
+    Equal values are stored once.
+    Iteration follows the insertion order.
+    """
+
+    def __init__(
+        self, data: Mapping[Path, str] | None = None, table: PathTable | None = None
+    ) -> None:
+        data = data or {}
+        self.table = get_path_table(data) if table is None else table
+        values: dict[str, str] = {}
+        self._data: dict[PathParts, str] = {
+            self.table.intern(path): values.setdefault(value, value)
+            for path, value in data.items()
+        }
+
+    def __getitem__(self, key: Path) -> str:
+        try:
+            return self._data[_get_parts(key)]  # type: ignore[index]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return _get_parts(key) in self._data
+
+    def __iter__(self) -> Iterator[Path]:
+        return map(_to_path, self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def items(self) -> ItemsView[Path, str]:
+        return _PathMapItems(self)
+
+    def values(self) -> ValuesView[str]:
+        return self._data.values()
+
+    def parts(self) -> KeysView[PathParts]:
+        """
+        Returns:
+            The keys as tuples of path components
+        """
+        return self._data.keys()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PathMap):
+            return self._data == other._data
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Self:
+        # Immutable
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class _PathMapItems(ItemsView[Path, str]):
+    _mapping: PathMap
+
+    def __iter__(self) -> Iterator[tuple[Path, str]]:
+        for parts, value in self._mapping._data.items():
+            yield _to_path(parts), value
+
+
+class PathSet(Set[Path]):
+    """
+    Immutable set of paths stored in a PathTable
+    """
+
+    def __init__(
+        self, paths: Iterable[Path] = (), table: PathTable | None = None
+    ) -> None:
+        self.table = get_path_table(paths) if table is None else table
+        self._parts = frozenset(map(self.table.intern, paths))
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[Any]) -> frozenset[Any]:
+        # Results of set operations are regular frozensets
+        return frozenset(it)
+
+    def __contains__(self, key: object) -> bool:
+        return _get_parts(key) in self._parts
+
+    def __iter__(self) -> Iterator[Path]:
+        return map(_to_path, self._parts)
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def parts(self) -> frozenset[PathParts]:
+        """
+        Returns:
+            The paths as tuples of path components
+        """
+        return self._parts
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PathSet):
+            return self._parts == other._parts
+        return super().__eq__(other)
+
+    # Hashes the same as a frozenset of the paths
+    __hash__ = Set._hash
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Self:
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({set(self)!r})"
+
+
+class PathSequence(Sequence[Path]):
+    """
+    Immutable sequence of paths stored in a PathTable that are joined with
+    `directory` when they are retrieved.
+    Compares equal to tuples with the same paths.
+    """
+
+    def __init__(
+        self, directory: Path, parts: Iterable[PathParts], table: PathTable
+    ) -> None:
+        self.directory = directory
+        self.table = table
+        self._parts = tuple(parts)
+
+    @overload
+    def __getitem__(self, index: int) -> Path: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[Path, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> Path | tuple[Path, ...]:
+        if isinstance(index, slice):
+            return tuple(map(self._get, self._parts[index]))
+        return self._get(self._parts[index])
+
+    def _get(self, parts: PathParts) -> Path:
+        return self.directory.joinpath(*parts)
+
+    def __iter__(self) -> Iterator[Path]:
+        return map(self._get, self._parts)
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (tuple, PathSequence)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Self:
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({tuple(self)!r})"
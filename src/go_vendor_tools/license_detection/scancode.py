@@ -12,8 +12,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NamedTuple, TypedDict, cast
 
-from go_vendor_tools.license_detection.search import find_license_files
-
 try:
     import scancode.api  # type: ignore[import]
 except ImportError:
@@ -23,12 +21,18 @@ else:
 
 from go_vendor_tools.config.licenses import LicenseConfig
 from go_vendor_tools.license_detection.base import (
+    ContentDeduplicator,
+    DetectorInputs,
     LicenseData,
     LicenseDetector,
     LicenseDetectorNotAvailableError,
     get_manual_license_entries,
     reuse_path_to_license_map,
 )
+from go_vendor_tools.license_detection.search import (
+    group_license_files,
+    split_license_files,
+)
 
 if TYPE_CHECKING:
     from _typeshed import StrPath
@@ -55,17 +59,28 @@ class ScancodeResult(NamedTuple):
 def get_scancode_license_data(
     directory: Path,
     files: Iterable[Path],
+    dedup: ContentDeduplicator[Path] | None = None,
 ) -> ScancodeResult:
+    """
+    Scan license files with scancode.
+    Only one file per group of byte-identical files is scanned.
+    Pass a `dedup` object to use a DetectionCache.
+    """
     data_dicts: dict[str, ScancodeLicenseDict] = {}
     simplified_map: dict[Path, str] = {}
     undetected: set[Path] = set()
-    for file in files:
+    if dedup is None:
+        dedup = ContentDeduplicator(directory)
+    unique_data: dict[Path, ScancodeLicenseDict] = {}
+    for file in dedup.unique(files):
         data = cast(
             ScancodeLicenseDict, scancode.api.get_licenses(str(directory / file))
         )
         data["license_detections"].sort(
             key=lambda d: d.get("license_expression_spdx") or ""
         )
+        unique_data[file] = data
+    for file, data in dedup.fan_out(unique_data).items():
         data_dicts[str(file)] = data
 
         if data["detected_license_expression_spdx"] is None:
@@ -86,6 +101,7 @@ class ScancodeLicenseData(LicenseData):
 
 class ScancodeLicenseDetector(LicenseDetector[ScancodeLicenseData]):
     NAME = "scancode"
+    LICENSE_DATA_CLASS = ScancodeLicenseData
     PACKAGES_NEEDED = ("go-vendor-tools+scancode",)
 
     def __init__(
@@ -102,21 +118,39 @@ class ScancodeLicenseDetector(LicenseDetector[ScancodeLicenseData]):
         self.detector_config = detector_config
         self.license_config = license_config
 
-    def detect(self, directory: StrPath, reuse_roots: Collection[StrPath] = ()):
+    def get_detector_version(self) -> str:
+        # Importing importlib.metadata is slow, and the version is only needed
+        # for cache keys
+        import importlib.metadata  # noqa: PLC0415
+
+        try:
+            return importlib.metadata.version("scancode-toolkit")
+        except importlib.metadata.PackageNotFoundError:
+            return ""
+
+    def detect(
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = (),
+        inputs: DetectorInputs | None = None,
+    ):
         if self.find_only:
             raise ValueError(
                 "This cannot be called when class was initalized with find_only=True"
             )
         directory = Path(directory)
-        license_file_lists = find_license_files(
-            directory,
-            relative_paths=True,
-            exclude_directories=self.license_config["exclude_directories"],
-            exclude_files=self.license_config["exclude_files"],
-            reuse_roots=reuse_roots,
-        )
+        license_file_lists = group_license_files(())
+        # Start detecting license files while the tree is still being walked
         data, license_map, undetected = get_scancode_license_data(
-            directory, map(Path, license_file_lists["license"])
+            directory,
+            map(
+                Path,
+                split_license_files(
+                    self._iter_input_license_files(directory, reuse_roots, inputs),
+                    license_file_lists,
+                ),
+            ),
+            self._get_content_deduplicator(directory),
         )
         manual_license_map, manual_unmatched = get_manual_license_entries(
             self.license_config["licenses"], directory
@@ -141,6 +175,7 @@ class ScancodeLicenseDetector(LicenseDetector[ScancodeLicenseData]):
             raise ValueError(
                 "This cannot be called when class was initalized with find_only=True"
             )
+        directory = directory if directory is not None else Path("/")
         return get_scancode_license_data(
-            directory if directory is not None else Path("/"), files
+            directory, files, self._get_content_deduplicator(directory)
         )[1:]
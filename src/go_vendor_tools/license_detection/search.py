@@ -6,9 +6,11 @@ import enum
 import fnmatch
 import os
 import re
-from collections.abc import Collection, Sequence
+from collections.abc import Collection, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
     from _typeshed import StrPath
@@ -112,10 +114,378 @@ NOTICE_FILE_TYPE = LicenseRegexFileType(
 DEFAULT_FILE_TYPES = (LICENSE_FILE_TYPE, NOTICE_FILE_TYPE)
 
 
+_INLINE_FLAGS = {
+    re.ASCII: "a",
+    re.IGNORECASE: "i",
+    re.MULTILINE: "m",
+    re.DOTALL: "s",
+    re.VERBOSE: "x",
+}
+
+
+def _scoped_pattern(pattern: re.Pattern[str]) -> str:
+    """
+    Return `pattern` as a group that keeps its flags when it's embedded in
+    another regular expression
+    """
+    flags = "".join(
+        char for flag, char in _INLINE_FLAGS.items() if pattern.flags & flag
+    )
+    # The newline terminates a trailing comment in verbose patterns
+    newline = "\n" if pattern.flags & re.VERBOSE else ""
+    return f"(?{flags}:{pattern.pattern}{newline})"
+
+
+class LicenseFileClassifier:
+    """
+    Classify file names using a sequence of LicenseRegexFileTypes.
+
+    All of the file types are compiled into a single alternation with one named
+    group per file type, so a file name is checked with one `fullmatch()` call
+    instead of up to three per file type.
+    Vendor trees contain the same file names (LICENSE, README.md, doc.go, ...)
+    over and over again, so the result is cached per file name.
+    There are separate regexes and caches for files in the root project and
+    files in subdirectories of vendor/, as the `exclude_subdir_regex`es only
+    apply to the latter.
+    """
+
+    def __init__(
+        self, filetype_info: Sequence[LicenseRegexFileType] = DEFAULT_FILE_TYPES
+    ) -> None:
+        self.filetype_info = tuple(filetype_info)
+        # Use generated group names, as file type names don't need to be
+        # valid Python identifiers
+        self._group_names = {
+            f"filetype{index}": ft.name for index, ft in enumerate(self.filetype_info)
+        }
+        self._root_regex = self._compile(subdir=False)
+        self._subdir_regex = self._compile(subdir=True)
+        self._root_cache: dict[str, str | None] = {}
+        self._subdir_cache: dict[str, str | None] = {}
+
+    def _compile(self, subdir: bool) -> re.Pattern[str]:
+        branches: list[str] = []
+        for group_name, ft in zip(self._group_names, self.filetype_info):
+            excludes = [ft.exclude_regex]
+            if subdir:
+                excludes.append(ft.exclude_subdir_regex)
+            lookaheads = "".join(
+                rf"(?!{_scoped_pattern(regex)}\Z)" for regex in excludes if regex
+            )
+            branches.append(
+                f"(?P<{group_name}>{lookaheads}{_scoped_pattern(ft.regex)})"
+            )
+        # An empty alternation should never match
+        return re.compile("|".join(branches) or "(?!)")
+
+    def classify(self, name: str, in_subdir: bool = False) -> str | None:
+        """
+        Args:
+            name: File basename
+            in_subdir: Whether the file is in a subdirectory of vendor/
+
+        Returns:
+            Name of the first matching LicenseRegexFileType or None
+        """
+        cache = self._subdir_cache if in_subdir else self._root_cache
+        try:
+            return cache[name]
+        except KeyError:
+            pass
+        regex = self._subdir_regex if in_subdir else self._root_regex
+        result: str | None = None
+        if match := regex.fullmatch(name):
+            result = self._group_names[cast(str, match.lastgroup)]
+        cache[name] = result
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_license_file_classifier(
+    filetype_info: tuple[LicenseRegexFileType, ...] = DEFAULT_FILE_TYPES,
+) -> LicenseFileClassifier:
+    """
+    Get a (cached) LicenseFileClassifier so file names are only classified once
+    per run
+    """
+    return LicenseFileClassifier(filetype_info)
+
+
+def compile_exclude_globs(globs: Collection[str]) -> re.Pattern[str] | None:
+    """
+    Compile `fnmatch`-style globs into a single regex that matches relative
+    paths.
+    Note that `*` also matches `/`.
+
+    Returns:
+        Compiled regex or None if `globs` is empty
+    """
+    if not globs:
+        return None
+    return re.compile("|".join(fnmatch.translate(glob.rstrip("/")) for glob in globs))
+
+
 def _clean_dirnames(dirnames: Collection[object]) -> set[str]:
     return {d.rstrip("/") for d in map(str, dirnames)}
 
 
+def _is_reuse_dir(relpath: str, reuse_roots: Collection[str]) -> bool:
+    return os.path.basename(relpath) == "LICENSES" and (
+        # "" if the parent is the root directory, which we always want to
+        # consider as a reuse directory
+        (parent := os.path.dirname(relpath)) == ""
+        or parent in reuse_roots
+    )
+
+
+def _scan_tree(
+    directory: str,
+    exclude_directories: Collection[str],
+    reuse_roots: Collection[str],
+    start: str = "",
+    max_depth: int | None = None,
+    *,
+    exclude_glob: re.Pattern[str] | None = None,
+) -> Iterator[tuple[str, str, bool, list[str]]]:
+    """
+    Walk `directory` with `os.scandir()`, keeping track of relative paths as we
+    descend instead of recomputing them with `os.path.relpath()`.
+
+    This traverses the tree in the same (top-down, depth-first) order as
+    `os.walk()` with the default arguments: symlinks to directories are not
+    followed and directories that cannot be listed are silently skipped.
+
+    Args:
+        directory: Base directory
+        exclude_directories: Directory paths relative to `directory` to prune
+        reuse_roots: Directories to search for REUSE-style LICENSES directory
+        start: Path relative to `directory` of the directory to walk
+        max_depth:
+            Maximum number of directory levels below `start` to descend
+            into or None to walk the whole tree.
+            REUSE LICENSES directories are always walked.
+        exclude_glob:
+            Regex from `compile_exclude_globs()` that matches relative
+            directory paths to prune
+
+    Yields:
+        (full path to directory, path relative to `directory` ("" for
+         `directory` itself), whether the directory is a REUSE LICENSES
+         directory, list of file names)
+    """
+    if start:
+        in_reuse_dir = _is_reuse_dir(start, reuse_roots)
+    else:
+        # The root directory's basename is used here to match os.walk()
+        in_reuse_dir = os.path.basename(directory) == "LICENSES"
+    # Stack of (full path, relative path, whether it's a REUSE directory, depth)
+    stack: list[tuple[str, str, bool, int]] = [
+        (os.path.join(directory, start) if start else directory, start, in_reuse_dir, 0)
+    ]
+    while stack:
+        root, relroot, in_reuse_dir, depth = stack.pop()
+        descend = max_depth is None or depth < max_depth
+        files: list[str] = []
+        subdirs: list[tuple[str, str, bool, int]] = []
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry.name)
+                    # If it's a REUSE directory, we don't need to recurse any further
+                    elif in_reuse_dir:
+                        continue
+                    else:
+                        relpath = os.path.join(relroot, entry.name)
+                        if (
+                            relpath in exclude_directories
+                            or entry.is_symlink()
+                            or (exclude_glob and exclude_glob.match(relpath))
+                        ):
+                            continue
+                        is_reuse_dir = entry.name == "LICENSES" and (
+                            relroot == "" or relroot in reuse_roots
+                        )
+                        if descend or is_reuse_dir:
+                            subdirs.append(
+                                (entry.path, relpath, is_reuse_dir, depth + 1)
+                            )
+        except OSError:
+            continue
+        yield root, relroot, in_reuse_dir, files
+        stack.extend(reversed(subdirs))
+
+
+def _get_vendor_directory(module_root: str) -> str | None:
+    parts = module_root.split(os.sep)
+    try:
+        index = parts.index("vendor")
+    except ValueError:
+        return None
+    return os.sep.join(parts[: index + 1])
+
+
+def _is_excluded(
+    relpath: str,
+    exclude_directories: Collection[str],
+    exclude_glob: re.Pattern[str] | None = None,
+) -> bool:
+    parts = relpath.split(os.sep)
+    for index in range(len(parts)):
+        parent = os.sep.join(parts[: index + 1])
+        if parent in exclude_directories or (
+            exclude_glob and exclude_glob.match(parent)
+        ):
+            return True
+    return False
+
+
+def _scan_module_trees(
+    directory: str,
+    exclude_directories: Collection[str],
+    reuse_roots: Collection[str],
+    *,
+    module_roots: Collection[str],
+    modules_only: bool,
+    max_depth: int | None,
+    jobs: int,
+    exclude_glob: re.Pattern[str] | None = None,
+) -> Iterator[tuple[str, str, bool, list[str]]]:
+    """
+    Walk the top-level project and each Go module root separately.
+    When `jobs` is greater than 1, the module roots are walked concurrently
+    on a thread pool.
+    Directory listings are blocking syscalls, so this helps on latency-bound
+    filesystems (NFS, overlayfs, etc.).
+
+    The top-level walk skips the module roots (and, when `modules_only` is
+    True, the vendor directories that contain them) and the module walks skip
+    nested module roots, so every directory is walked at most once.
+    """
+    module_roots = sorted(
+        root
+        for root in module_roots
+        if not _is_excluded(root, exclude_directories, exclude_glob)
+    )
+    skip = {*exclude_directories, *module_roots}
+    if modules_only:
+        skip.update(filter(None, map(_get_vendor_directory, module_roots)))
+    else:
+        max_depth = None
+    scan = partial(_scan_tree, directory, skip, reuse_roots, exclude_glob=exclude_glob)
+    if jobs <= 1:
+        yield from scan(max_depth=max_depth)
+        for root in module_roots:
+            yield from scan(root, max_depth)
+        return
+    with ThreadPoolExecutor(jobs) as executor:
+        # The generators are consumed in the worker threads
+        futures = [
+            executor.submit(list, scan(root, max_depth)) for root in module_roots
+        ]
+        yield from scan(max_depth=max_depth)
+        for future in futures:
+            yield from future.result()
+
+
+def iter_license_files(
+    directory: StrPath,
+    relative_paths: bool,
+    exclude_directories: Collection[str] = (),
+    exclude_files: Collection[str] = (),
+    reuse_roots: Collection[StrPath] = (),
+    *,
+    filetype_info: Sequence[LicenseRegexFileType] = DEFAULT_FILE_TYPES,
+    module_roots: Collection[StrPath] = (),
+    modules_only: bool = False,
+    max_depth: int | None = None,
+    jobs: int = 1,
+    exclude_globs: Collection[str] = (),
+) -> Iterator[tuple[str, str]]:
+    """
+    Find license files of different types and yield them as they're discovered
+    so callers can start processing them before the walk finishes.
+
+    See `find_license_files()` for the arguments.
+
+    Yields:
+        (file type name or "reuse", path)
+    """
+    exclude_directories = _clean_dirnames(exclude_directories)
+    reuse_roots = _clean_dirnames(reuse_roots)
+    vendor_prefix = f"vendor{os.sep}"
+    classifier = get_license_file_classifier(tuple(filetype_info))
+    exclude_glob = compile_exclude_globs(exclude_globs)
+    walker = _scan_module_trees(
+        os.fspath(directory),
+        exclude_directories,
+        reuse_roots,
+        module_roots=_clean_dirnames(module_roots),
+        modules_only=modules_only,
+        max_depth=max_depth,
+        jobs=jobs,
+        exclude_glob=exclude_glob,
+    )
+    for root, relroot, in_reuse_dir, files in walker:
+        in_subdir = relroot.startswith(vendor_prefix)
+        for file in files:
+            filepath = os.path.join(relroot, file)
+            if filepath in exclude_files or (
+                exclude_glob and exclude_glob.match(filepath)
+            ):
+                continue
+            if in_reuse_dir:
+                filetype: str | None = "reuse"
+            else:
+                filetype = classifier.classify(file, in_subdir)
+            if filetype:
+                yield filetype, (
+                    filepath if relative_paths else os.path.join(root, file)
+                )
+
+
+def group_license_files(
+    files: Iterable[tuple[str, str]],
+    filetype_info: Sequence[LicenseRegexFileType] = DEFAULT_FILE_TYPES,
+) -> dict[str, list[str]]:
+    """
+    Collect `iter_license_files()` output into a mapping of file type names
+    (and "reuse") to sorted lists of paths
+    """
+    licenses: dict[str, list[str]] = {ft.name: [] for ft in filetype_info}
+    licenses["reuse"] = []
+    for filetype, path in files:
+        licenses[filetype].append(path)
+    for paths in licenses.values():
+        paths.sort()
+    return licenses
+
+
+def split_license_files(
+    files: Iterable[tuple[str, str]],
+    license_file_lists: dict[str, list[str]],
+    filetype: str = LICENSE_FILE_TYPE.name,
+) -> Iterator[str]:
+    """
+    Yield the paths of `filetype` files from `iter_license_files()` output and
+    add all files (including those of `filetype`) to `license_file_lists`.
+    This allows passing license files to a detector while the tree is still
+    being walked.
+    The lists in `license_file_lists` are sorted once `files` is exhausted.
+    """
+    for type_, path in files:
+        license_file_lists.setdefault(type_, []).append(path)
+        if type_ == filetype:
+            yield path
+    for paths in license_file_lists.values():
+        paths.sort()
+
+
 def find_license_files(
     directory: StrPath,
     relative_paths: bool,
@@ -125,7 +495,12 @@ def find_license_files(
     reuse_roots: Collection[StrPath] = (),
     *,
     filetype_info: Sequence[LicenseRegexFileType] = DEFAULT_FILE_TYPES,
-):
+    module_roots: Collection[StrPath] = (),
+    modules_only: bool = False,
+    max_depth: int | None = None,
+    jobs: int = 1,
+    exclude_globs: Collection[str] = (),
+) -> dict[str, list[str]]:
     """
     Find license files of different types
 
@@ -135,51 +510,40 @@ def find_license_files(
         exclude_directories: Directory paths relative to `directory` to exclude
         exclude_files: File paths relative to `directory` to exclude
         reuse_roots: Directories to search for REUSE-style LICENSES directory
+        filetype_info: License file types to search for
+        module_roots:
+            Relative paths to the vendored Go modules.
+            The tree is walked separately for the top-level project and
+            each module root.
+        modules_only:
+            Only walk the top-level project and the module roots instead of the
+            whole tree
+        max_depth:
+            Maximum number of directory levels to descend below the top-level
+            directory and each module root when `modules_only` is True
+        jobs:
+            Number of threads to use to walk the module roots concurrently
+        exclude_globs:
+            `fnmatch`-style globs of file and directory paths relative to
+            `directory` to exclude.
+            Matching directories are not descended into.
+
+    Returns:
+        Mapping of file type names (and "reuse") to sorted lists of paths
     """
-    licenses: dict[str, list[str]] = {ft.name: [] for ft in filetype_info}
-    licenses["reuse"] = []
-    exclude_directories = _clean_dirnames(exclude_directories)
-    reuse_roots = _clean_dirnames(reuse_roots)
-    for root, dirnames, files in os.walk(directory):
-        rootpath = os.path.relpath(root, directory)
-        rootbasename = os.path.basename(root)
-        rootdirname = os.path.dirname(rootpath)
-        in_reuse_dir = rootbasename == "LICENSES" and (
-            # "" if rootdirname is the root directory, which we always want
-            # to consider as a reuse directory
-            rootdirname == ""
-            or rootdirname in reuse_roots
-        )
-        if in_reuse_dir:
-            # If it's a REUSE directory, we don't need to recurse any further
-            dirnames.clear()
-        else:
-            for dirname in list(dirnames):
-                dirpath = os.path.relpath(os.path.join(root, dirname), directory)
-                if dirpath in exclude_directories:
-                    dirnames.remove(dirname)
-        for file in files:
-            fullpath = os.path.join(root, file)
-            filepath = os.path.relpath(fullpath, directory)
-            if filepath in exclude_files:
-                continue
-            if in_reuse_dir:
-                licenses["reuse"].append(filepath if relative_paths else fullpath)
-            else:
-                for ft in filetype_info:
-                    if ft.regex.fullmatch(file) and (
-                        (not ft.exclude_regex or not ft.exclude_regex.fullmatch(file))
-                        and (
-                            # Inside the root directory so n/a
-                            not rootpath.startswith(f"vendor{os.sep}")
-                            # Regex is None so n/a
-                            or not ft.exclude_subdir_regex
-                            # Regex does not match, so okay to include
-                            or not ft.exclude_subdir_regex.fullmatch(file)
-                        )
-                    ):
-                        licenses[ft.name].append(
-                            filepath if relative_paths else fullpath
-                        )
-                        break
-    return licenses
+    return group_license_files(
+        iter_license_files(
+            directory,
+            relative_paths,
+            exclude_directories,
+            exclude_files,
+            reuse_roots,
+            filetype_info=filetype_info,
+            module_roots=module_roots,
+            modules_only=modules_only,
+            max_depth=max_depth,
+            jobs=jobs,
+            exclude_globs=exclude_globs,
+        ),
+        filetype_info,
+    )
@@ -11,32 +11,34 @@ import dataclasses
 import json
 import shutil
 import subprocess
-from collections.abc import Collection, Iterable, Sequence
+from collections.abc import Callable, Collection, Iterable, Sequence
+from functools import partial
 from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
+from tempfile import TemporaryFile
+from typing import TYPE_CHECKING, Any, Literal, TypedDict, TypeVar, cast
 
 from go_vendor_tools.config.licenses import LicenseConfig
 from go_vendor_tools.exceptions import LicenseError
 from go_vendor_tools.license_detection.base import reuse_path_to_license_map
-from go_vendor_tools.license_detection.search import (
-    NOTICE_FILE_TYPE,
-    find_license_files,
-)
-from go_vendor_tools.licensing import combine_licenses, validate_license
+from go_vendor_tools.license_detection.search import NOTICE_FILE_TYPE
+from go_vendor_tools.licensing import LicenseAccumulator, validate_license
 
 from .base import (
+    DetectorInputs,
+    ExclusionMatcher,
     LicenseData,
     LicenseDetector,
     LicenseDetectorNotAvailableError,
     filter_license_map,
     get_manual_license_entries,
-    is_unwanted_path,
 )
 
 if TYPE_CHECKING:
     from _typeshed import StrPath
 
+_T = TypeVar("_T")
+
 
 class TrivyLicenseFileEntry(TypedDict):
     Severity: str
@@ -54,11 +56,37 @@ class TrivyLicenseDict(TypedDict):
     Licenses: list[TrivyLicenseFileEntry]
 
 
-def run_read_json(command: Sequence[StrPath]) -> Any:
-    proc: subprocess.CompletedProcess[str] = subprocess.run(
-        command, check=True, text=True, capture_output=True
-    )
-    return json.loads(proc.stdout)
+def run_read_json(
+    command: Sequence[StrPath], while_running: Callable[[], _T]
+) -> tuple[Any, _T]:
+    """
+    Run `command` and parse its stdout as JSON.
+    `while_running` is called while the command is running so other work can
+    overlap with it.
+    The command's output is written to temporary files so that the command
+    doesn't block on a full pipe while `while_running` runs.
+
+    Returns: (Parsed JSON, return value of `while_running`)
+    """
+    with TemporaryFile() as stdout, TemporaryFile() as stderr:
+        with subprocess.Popen(command, stdout=stdout, stderr=stderr) as proc:
+            try:
+                result = while_running()
+            except BaseException:
+                proc.kill()
+                raise
+            returncode = proc.wait()
+        stdout.seek(0)
+        output = stdout.read()
+        if returncode:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode,
+                command,
+                output.decode("utf-8", errors="replace"),
+                stderr.read().decode("utf-8", errors="replace"),
+            )
+    return json.loads(output), result
 
 
 @dataclasses.dataclass(frozen=True)
@@ -66,7 +94,14 @@ class TrivyLicenseData(LicenseData):
     trivy_license_data: TrivyLicenseDict
 
 
-def _load_license_data(trivy_path: StrPath, directory: StrPath) -> dict[str, Any]:
+def _load_license_data(
+    trivy_path: StrPath, directory: StrPath, while_running: Callable[[], _T]
+) -> tuple[dict[str, Any], _T]:
+    """
+    Run trivy's license scanner on `directory`.
+    `while_running` (e.g., our own license file search) is called while trivy
+    is scanning the tree.
+    """
     # fmt: off
     cmd = [
         trivy_path,
@@ -77,7 +112,7 @@ def _load_license_data(trivy_path: StrPath, directory: StrPath) -> dict[str, Any
         directory,
     ]
     # fmt: on
-    return run_read_json(cmd)
+    return run_read_json(cmd, while_running)
 
 
 def _license_data_to_trivy_license_dict(data: dict[str, Any]) -> TrivyLicenseDict:
@@ -91,18 +126,17 @@ def _trivy_license_dict_to_license_map(
     data: TrivyLicenseDict, config: LicenseConfig
 ) -> tuple[dict[Path, str], set[Path]]:
     license_map: dict[Path, str] = {}
+    # Paths with multiple matches
+    accumulators: dict[Path, LicenseAccumulator] = {}
     invalid: set[Path] = set()
+    is_excluded = ExclusionMatcher.from_license_config(config)
     for result in data.get("Licenses", []):
         path = Path(result["FilePath"])
         name = result["Name"]
         if (
             # https://gitlab.com/fedora/sigs/go/go-vendor-tools/-/issues/65
             path.suffix == ".sh"
-            or is_unwanted_path(
-                path,
-                exclude_directories=config["exclude_directories"],
-                exclude_files=config["exclude_files"],
-            )
+            or is_excluded(path)
         ):
             continue
         # Sometimes trivy returns names that aren't valid SPDX expressions.
@@ -111,22 +145,22 @@ def _trivy_license_dict_to_license_map(
             invalid.add(path)
             continue
         # License files can have multiple matches in trivy
-        if path in license_map:
-            license_map[path] = str(
-                combine_licenses(
-                    license_map[path],
-                    name,
-                    validate=False,
-                    strict=False,
-                )
+        if path in accumulators:
+            accumulators[path].add(name)
+        elif path in license_map:
+            accumulators[path] = LicenseAccumulator(
+                (license_map[path], name), validate=False, strict=False
             )
         else:
             license_map[path] = name
+    for path, accumulator in accumulators.items():
+        license_map[path] = str(accumulator)
     return license_map, invalid
 
 
 class TrivyLicenseDetector(LicenseDetector[TrivyLicenseData]):
     NAME = "trivy"
+    LICENSE_DATA_CLASS = TrivyLicenseData
     PACKAGES_NEEDED = ("trivy",)
     FIND_PACKAGES_NEEDED = PACKAGES_NEEDED
 
@@ -149,12 +183,33 @@ class TrivyLicenseDetector(LicenseDetector[TrivyLicenseData]):
         self.detector_config = detector_config
         self.license_config = license_config
 
+    def scan_inputs(
+        self,
+        directory: StrPath,  # noqa: ARG002
+        reuse_roots: Collection[StrPath] = (),  # noqa: ARG002
+        extra_files: Collection[StrPath] = (),  # noqa: ARG002
+    ) -> DetectorInputs | None:
+        # trivy scans every file in the tree, not just the license files that
+        # go_vendor_tools finds
+        return None
+
     # TODO(anyone): Consider splitting into separate functions
     # https://gitlab.com/gotmax23/go-vendor-tools/-/issues/23
     def detect(
-        self, directory: StrPath, reuse_roots: Collection[StrPath] = ()
+        self,
+        directory: StrPath,
+        reuse_roots: Collection[StrPath] = (),
+        inputs: DetectorInputs | None = None,
     ) -> TrivyLicenseData:
-        data = _load_license_data(self.path, directory)
+        data, license_file_lists = _load_license_data(
+            self.path,
+            directory,
+            (
+                partial(self._find_license_file_lists, directory, reuse_roots)
+                if inputs is None
+                else partial(dict, inputs.license_file_lists)
+            ),
+        )
         licenses = _license_data_to_trivy_license_dict(data)
         license_map, undetected = _trivy_license_dict_to_license_map(
             licenses, self.license_config
@@ -165,13 +220,6 @@ class TrivyLicenseDetector(LicenseDetector[TrivyLicenseData]):
         )
         undetected -= manual_license_map.keys()
         license_map |= manual_license_map
-        license_file_lists = find_license_files(
-            directory,
-            relative_paths=True,
-            exclude_directories=self.license_config["exclude_directories"],
-            exclude_files=self.license_config["exclude_files"],
-            reuse_roots=reuse_roots,
-        )
         license_map |= reuse_path_to_license_map(license_file_lists["reuse"])
         license_map = dict(sorted(license_map.items(), key=lambda item: item[0]))
         # Ensure that any license files found by searching the filesystem
@@ -194,7 +242,16 @@ class TrivyLicenseDetector(LicenseDetector[TrivyLicenseData]):
     def find_license_files(
         self, directory: StrPath, reuse_roots: Collection[StrPath] = ()
     ) -> list[Path]:
-        data = _load_license_data(self.path, directory)
+        data, license_file_lists = _load_license_data(
+            self.path,
+            directory,
+            partial(
+                self._find_license_file_lists,
+                directory,
+                reuse_roots,
+                [NOTICE_FILE_TYPE],
+            ),
+        )
         licenses = _license_data_to_trivy_license_dict(data)
         license_map, undetected = _trivy_license_dict_to_license_map(
             licenses, self.license_config
@@ -203,6 +260,7 @@ class TrivyLicenseDetector(LicenseDetector[TrivyLicenseData]):
             license_map,
             self.license_config["exclude_directories"],
             self.license_config["exclude_files"],
+            self.license_config["exclude_globs"],
         )
         manual_license_map, unmatched = get_manual_license_entries(
             self.license_config["licenses"], directory
@@ -213,14 +271,6 @@ class TrivyLicenseDetector(LicenseDetector[TrivyLicenseData]):
                 + "\n"
                 + "\n".join(map(str, unmatched)),
             )
-        license_file_lists = find_license_files(
-            directory,
-            relative_paths=True,
-            exclude_directories=self.license_config["exclude_directories"],
-            exclude_files=self.license_config["exclude_files"],
-            reuse_roots=reuse_roots,
-            filetype_info=[NOTICE_FILE_TYPE],
-        )
         files: set[Path] = {
             *filtered_license_map.keys(),
             *undetected,
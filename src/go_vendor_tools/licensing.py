@@ -7,17 +7,45 @@ Utilities for working with license expressions
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from functools import lru_cache, partial
-from typing import Any, cast
+import contextlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from functools import lru_cache, partial, wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar, cast
 
 import license_expression
 from boolean.boolean import DualBase
 
+from go_vendor_tools import __version__
+from go_vendor_tools.config.utils import get_user_cache_dir
 
-def get_fedora_licensing() -> license_expression.Licensing:
+if TYPE_CHECKING:
+    from _typeshed import StrPath
+
+_CallableT = TypeVar("_CallableT", bound=Callable[..., Any])
+
+# A single license key or a "KEY WITH EXCEPTION" expression
+_SINGLE_KEY_REGEX = re.compile(
+    r"^\s*([^\s()]+)(?:\s+with\s+([^\s()]+))?\s*$", flags=re.IGNORECASE
+)
+# Large packages have thousands of distinct per-file expressions
+DEFAULT_EXPRESSION_CACHE_SIZE = 4096
+LICENSE_INDEX_FORMAT_VERSION = 1
+LICENSE_INDEX_FILE_NAME = "fedora-license-index.json"
+# Written by `go_vendor_license build_license_index` when go-vendor-tools is
+# installed
+PREBUILT_LICENSE_INDEX_PATH = Path(__file__).with_name(LICENSE_INDEX_FILE_NAME)
+
+
+def build_fedora_license_index() -> list[dict[str, Any]]:
     """
-    Get a Licensing object modifed to prefer the LicenseRef-Fedora-* extensions
+    Convert license_expression's license index into the license table used by
+    `get_fedora_licensing()`
     """
     license_index = license_expression.get_license_index()
     public_dict: dict[str, Any] = {
@@ -41,10 +69,133 @@ def get_fedora_licensing() -> license_expression.Licensing:
             )
             continue
         lics.append(ld)
-    return license_expression.load_licensing_from_license_index(lics)
+    return lics
 
 
-licensing = get_fedora_licensing()
+def get_license_index_key() -> dict[str, Any]:
+    """
+    Identify the inputs of `build_fedora_license_index()`: the go_vendor_tools
+    and license_expression versions.
+    The key doesn't depend on where license_expression is installed, so a
+    prebuilt index stays valid until license_expression is updated.
+    """
+    # Importing importlib.metadata is slow, and the key is only needed when the
+    # licensing object is first built
+    import importlib.metadata  # noqa: PLC0415
+
+    try:
+        license_expression_version = importlib.metadata.version("license-expression")
+    except importlib.metadata.PackageNotFoundError:
+        # Fall back to the vendored license index's size and mtime
+        st = os.stat(license_expression.vendored_scancode_licensedb_index_location)
+        license_expression_version = f"unknown-{st.st_size}-{st.st_mtime_ns}"
+    return {
+        "go_vendor_tools": __version__,
+        "license_expression": license_expression_version,
+    }
+
+
+def dump_license_index(
+    path: StrPath,
+    license_index: list[dict[str, Any]] | None = None,
+    key: dict[str, Any] | None = None,
+) -> None:
+    """
+    Atomically write a license table from `build_fedora_license_index()` to
+    `path` in a compact form that's keyed on `get_license_index_key()`
+    """
+    path = Path(path)
+    data = {
+        "version": LICENSE_INDEX_FORMAT_VERSION,
+        "key": get_license_index_key() if key is None else key,
+        "licenses": [
+            [lic["key"], lic["aliases"], lic["is_exception"]]
+            for lic in (
+                build_fedora_license_index() if license_index is None else license_index
+            )
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_license_index(
+    path: StrPath, key: dict[str, Any]
+) -> list[dict[str, Any]] | None:
+    """
+    Load a license table written by `dump_license_index()`
+
+    Returns:
+        The license table or None if the file doesn't exist, is invalid, or
+        was written for a different `key`
+    """
+    try:
+        with open(path, encoding="utf-8") as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != LICENSE_INDEX_FORMAT_VERSION
+        or data.get("key") != key
+    ):
+        return None
+    return [
+        {"key": name, "aliases": aliases, "is_exception": is_exception}
+        for name, aliases, is_exception in data["licenses"]
+    ]
+
+
+def get_license_index_cache_path() -> Path:
+    return get_user_cache_dir() / LICENSE_INDEX_FILE_NAME
+
+
+def get_fedora_license_index() -> list[dict[str, Any]]:
+    """
+    Get the license table from `build_fedora_license_index()`.
+    The table is loaded from the prebuilt file or the user cache when
+    possible.
+    Otherwise, it's built and stored in the user cache.
+    """
+    key = get_license_index_key()
+    cache_path = get_license_index_cache_path()
+    for path in (PREBUILT_LICENSE_INDEX_PATH, cache_path):
+        if (loaded := load_license_index(path, key)) is not None:
+            return loaded
+    license_index = build_fedora_license_index()
+    # The cache is only an optimization
+    with contextlib.suppress(OSError):
+        dump_license_index(cache_path, license_index, key)
+    return license_index
+
+
+def get_fedora_licensing() -> license_expression.Licensing:
+    """
+    Get a Licensing object modifed to prefer the LicenseRef-Fedora-* extensions
+    """
+    return license_expression.load_licensing_from_license_index(
+        get_fedora_license_index()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_licensing() -> license_expression.Licensing:
+    """
+    Get the shared Licensing object from `get_fedora_licensing()`.
+    Loading the license index is expensive, so the object is only created on
+    first use.
+    """
+    return get_fedora_licensing()
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatibility for the module-level object that used to be
+    # created at import time
+    if name == "licensing":
+        return get_licensing()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def combine_licenses(
@@ -69,12 +220,116 @@ def combine_licenses(
     filtered = [converter(expression) for expression in expressions if expression]
     filtered.sort()
     return simplify_license(
-        str(license_expression.combine_expressions(filtered, licensing=licensing)),
+        str(
+            license_expression.combine_expressions(filtered, licensing=get_licensing())
+        ),
         validate=validate,
         strict=strict,
     )
 
 
+class ExpressionCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int | None
+    currsize: int
+
+
+class ExpressionCache:
+    """
+    Thread-safe LRU cache for the expression functions in this module that
+    counts hits, misses, and evictions.
+    A `maxsize` of None means unbounded.
+    """
+
+    def __init__(self, maxsize: int | None = DEFAULT_EXPRESSION_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int | None) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def cache_info(self) -> ExpressionCacheInfo:
+        with self._lock:
+            return ExpressionCacheInfo(
+                self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+            )
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+EXPRESSION_CACHES: dict[str, ExpressionCache] = {}
+_MISSING = object()
+
+
+def expression_cache(func: _CallableT) -> _CallableT:
+    """
+    Cache `func`'s results in an ExpressionCache registered in
+    `EXPRESSION_CACHES` under the function's name.
+    Like `functools.lru_cache()`, the wrapper has `cache_info()` and
+    `cache_clear()` methods.
+    """
+    cache = EXPRESSION_CACHES[func.__name__] = ExpressionCache()
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (*args, _MISSING, *sorted(kwargs.items())) if kwargs else args
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+        return value
+
+    wrapper.cache_info = cache.cache_info  # type: ignore[attr-defined]
+    wrapper.cache_clear = cache.cache_clear  # type: ignore[attr-defined]
+    return cast("_CallableT", wrapper)
+
+
+def set_expression_cache_size(maxsize: int | None) -> None:
+    """
+    Resize all of the expression caches.
+    A `maxsize` of None means unbounded.
+    """
+    for cache in EXPRESSION_CACHES.values():
+        cache.resize(maxsize)
+
+
+def get_expression_cache_info() -> dict[str, ExpressionCacheInfo]:
+    return {name: cache.cache_info() for name, cache in EXPRESSION_CACHES.items()}
+
+
 def _sort_expression_recursive(
     parsed: license_expression.LicenseExpression, /
 ) -> license_expression.LicenseExpression:
@@ -84,7 +339,56 @@ def _sort_expression_recursive(
     return parsed
 
 
-@lru_cache(500)
+@lru_cache(maxsize=None)
+def get_symbol_table() -> dict[str, license_expression.LicenseSymbol]:
+    """
+    Map lowercase license keys and aliases of the `get_licensing()` object's
+    symbols to the symbols.
+    Names that are shared by multiple symbols are left out.
+    """
+    table: dict[str, license_expression.LicenseSymbol] = {}
+    ambiguous: set[str] = set()
+    for symbol in get_licensing().known_symbols.values():
+        for name in map(str.lower, (symbol.key, *symbol.aliases)):
+            if table.setdefault(name, symbol) is not symbol:
+                ambiguous.add(name)
+    for name in ambiguous:
+        del table[name]
+    return table
+
+
+def _parse_single_key(
+    expression: str, strict: bool
+) -> license_expression.LicenseExpression | None:
+    """
+    Resolve a bare license key or `KEY WITH EXCEPTION` expression from
+    `get_symbol_table()` without running the full expression parser.
+
+    Returns:
+        The parsed expression or None if `expression` is not a simple
+        expression with known keys.
+        The full parser should be used in that case.
+    """
+    if not (match := _SINGLE_KEY_REGEX.match(expression)):
+        return None
+    table = get_symbol_table()
+    license_key, exception_key = match.groups()
+    if (symbol := table.get(license_key.lower())) is None or (
+        strict and symbol.is_exception
+    ):
+        return None
+    if exception_key is None:
+        return symbol
+    if (exception := table.get(exception_key.lower())) is None or (
+        strict and not exception.is_exception
+    ):
+        return None
+    return license_expression.LicenseWithExceptionSymbol(
+        license_symbol=symbol, exception_symbol=exception, strict=strict
+    )
+
+
+@expression_cache
 def parse(
     expression: str | license_expression.LicenseExpression,
     validate: bool = True,
@@ -93,20 +397,14 @@ def parse(
     """
     (Cached) Parse a string into a LicenseExpression object.
     """
-    return licensing.parse(str(expression), validate=validate, strict=strict)
+    expression = str(expression)
+    # Most per-file expressions are a single license key
+    if (parsed := _parse_single_key(expression, strict)) is not None:
+        return parsed
+    return get_licensing().parse(expression, validate=validate, strict=strict)
 
 
-@lru_cache(500)
-def simplify_license(
-    expression: str | license_expression.LicenseExpression,
-    *,
-    validate: bool = True,
-    strict: bool = True,
-) -> str:
-    """
-    Simplify and verify a license expression
-    """
-    parsed = parse(expression, validate=validate, strict=strict)
+def _simplify_parsed(parsed: license_expression.LicenseExpression, /) -> str:
     # DualBase subclasses are collections of licenses with an "AND" or an "OR"
     # relationship.
     if not isinstance(parsed, DualBase):
@@ -114,17 +412,105 @@ def simplify_license(
     # Flatten licenses (e.g., "(MIT AND ISC) AND MIT" -> "MIT AND ISC"
     parsed = parsed.flatten()
     # Perform further license_expression-specific deduplication
-    parsed = licensing.dedup(parsed)
+    parsed = get_licensing().dedup(parsed)
     # Recursively sort AND/OR expressions
     parsed = _sort_expression_recursive(parsed)
     return str(parsed)
 
 
+@expression_cache
+def simplify_license(
+    expression: str | license_expression.LicenseExpression,
+    *,
+    validate: bool = True,
+    strict: bool = True,
+) -> str:
+    """
+    Simplify and verify a license expression
+    """
+    return _simplify_parsed(parse(expression, validate=validate, strict=strict))
+
+
+class LicenseAccumulator:
+    """
+    Incrementally combine license expressions with AND.
+
+    Each expression is simplified when it is added and the distinct
+    simplified expressions are stored in a set, so adding an expression only
+    costs as much as that expression and repeated expressions are free.
+    The combined expression is only built when `expression` is accessed.
+    It is built by `combine_licenses()`, so it is the same as
+    `combine_licenses()`'s result for the same expressions.
+    """
+
+    def __init__(
+        self,
+        expressions: Iterable[str | license_expression.LicenseExpression | None] = (),
+        *,
+        validate: bool = True,
+        strict: bool = True,
+    ) -> None:
+        self.validate = validate
+        self.strict = strict
+        self._expressions: set[str] = set()
+        self._expression: str | None = None
+        self.update(expressions)
+
+    def add(
+        self, expression: str | license_expression.LicenseExpression | None
+    ) -> None:
+        """
+        Add an expression.
+        Empty expressions and None are ignored.
+        """
+        if not expression:
+            return
+        # Like combine_licenses(), only the combined expression is validated
+        simplified = simplify_license(expression, validate=False, strict=False)
+        if simplified not in self._expressions:
+            self._expressions.add(simplified)
+            self._expression = None
+
+    def update(
+        self, expressions: Iterable[str | license_expression.LicenseExpression | None]
+    ) -> None:
+        for expression in expressions:
+            self.add(expression)
+
+    @property
+    def expressions(self) -> frozenset[str]:
+        """
+        Distinct simplified expressions
+        """
+        return frozenset(self._expressions)
+
+    @property
+    def expression(self) -> str | None:
+        """
+        The combined expression or None if no expressions were added
+        """
+        if self._expression is None and self._expressions:
+            # The expressions are already simplified
+            self._expression = combine_licenses(
+                *self._expressions,
+                validate=self.validate,
+                strict=self.strict,
+                recursive_simplify=False,
+            )
+        return self._expression
+
+    def __bool__(self) -> bool:
+        return bool(self._expressions)
+
+    def __str__(self) -> str:
+        return str(self.expression)
+
+
 def get_unknown_license_keys(
     expression: str | license_expression.LicenseExpression,
 ) -> list[str]:
     parsed = parse(expression, validate=False, strict=False)
-    return licensing.unknown_license_keys(parsed)
+    return get_licensing().unknown_license_keys(parsed)
 
 
 def validate_license(expression: str) -> bool:
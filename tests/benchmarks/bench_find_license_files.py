@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Compare the scandir-based find_license_files() against the previous os.walk()
+implementation on a synthetic vendor tree
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+from collections.abc import Collection
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from vendor_tree import generate_vendor_tree
+
+from go_vendor_tools.license_detection.search import (
+    DEFAULT_FILE_TYPES,
+    find_license_files,
+)
+
+
+def find_license_files_os_walk(
+    directory: str,
+    relative_paths: bool,
+    exclude_directories: Collection[str] = (),
+    exclude_files: Collection[str] = (),
+    reuse_roots: Collection[str] = (),
+) -> dict[str, list[str]]:
+    """
+    The os.walk() based implementation that find_license_files() replaced
+    """
+    licenses: dict[str, list[str]] = {ft.name: [] for ft in DEFAULT_FILE_TYPES}
+    licenses["reuse"] = []
+    for root, dirnames, files in os.walk(directory):
+        rootpath = os.path.relpath(root, directory)
+        rootdirname = os.path.dirname(rootpath)
+        in_reuse_dir = os.path.basename(root) == "LICENSES" and (
+            rootdirname == "" or rootdirname in reuse_roots
+        )
+        if in_reuse_dir:
+            dirnames.clear()
+        else:
+            for dirname in list(dirnames):
+                dirpath = os.path.relpath(os.path.join(root, dirname), directory)
+                if dirpath in exclude_directories:
+                    dirnames.remove(dirname)
+        for file in files:
+            fullpath = os.path.join(root, file)
+            filepath = os.path.relpath(fullpath, directory)
+            if filepath in exclude_files:
+                continue
+            if in_reuse_dir:
+                licenses["reuse"].append(filepath if relative_paths else fullpath)
+                continue
+            for ft in DEFAULT_FILE_TYPES:
+                if ft.regex.fullmatch(file) and (
+                    (not ft.exclude_regex or not ft.exclude_regex.fullmatch(file))
+                    and (
+                        not rootpath.startswith(f"vendor{os.sep}")
+                        or not ft.exclude_subdir_regex
+                        or not ft.exclude_subdir_regex.fullmatch(file)
+                    )
+                ):
+                    licenses[ft.name].append(filepath if relative_paths else fullpath)
+                    break
+    return licenses
+
+
+def _sorted_values(licenses: dict[str, list[str]]) -> dict[str, list[str]]:
+    # os.walk() returns the files in directory order
+    return {name: sorted(files) for name, files in licenses.items()}
+
+
+def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parseargs(argv)
+    with TemporaryDirectory() as tmp:
+        print(f"Generating a tree with {args.modules} modules...", file=sys.stderr)
+        generate_vendor_tree(Path(tmp), args.modules)
+        if _sorted_values(find_license_files(tmp, True)) != _sorted_values(
+            find_license_files_os_walk(tmp, True)
+        ):
+            sys.exit("ERROR: Implementations returned different results!")
+        results: dict[str, float] = {}
+        for name, func in (
+            ("os.walk", find_license_files_os_walk),
+            ("scandir", find_license_files),
+        ):
+            timer = timeit.Timer(partial(func, tmp, True))
+            results[name] = min(timer.repeat(args.repeat, 1))
+            print(f"{name}: {results[name]:.3f}s")
+        print(f"Speedup: {results['os.walk'] / results['scandir']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
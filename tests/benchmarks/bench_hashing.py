@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Compare the file hashing strategies in go_vendor_tools.hashing across file
+sizes
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import timeit
+from collections.abc import Callable
+from functools import partial
+from io import FileIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from go_vendor_tools.hashing import (
+    _hash_file,
+    _hash_file_digest,
+    _hash_mmap,
+    _hash_readinto,
+)
+
+SIZES = (1024, 16 * 1024, 256 * 1024, 1024**2, 4 * 1024**2, 16 * 1024**2, 64 * 1024**2)
+
+
+def hash_chunks_4k(fp: FileIO) -> str:
+    """
+    The 4 KiB read loop that get_hash() originally used
+    """
+    hasher = hashlib.sha256()
+    while chunk := fp.read(4096):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def open_and(func: Callable[[FileIO], str]) -> Callable[[Path], str]:
+    def wrapper(path: Path) -> str:
+        with path.open("rb", buffering=0) as fp:
+            return func(fp)
+
+    return wrapper
+
+
+def get_strategies() -> dict[str, Callable[[Path], str]]:
+    strategies: dict[str, Callable[[Path], str]] = {
+        "read 4 KiB": open_and(hash_chunks_4k),
+        "readinto 1 MiB": open_and(_hash_readinto),
+        "mmap": open_and(_hash_mmap),
+    }
+    if hasattr(hashlib, "file_digest"):
+        strategies["file_digest"] = open_and(_hash_file_digest)
+    # The combined strategy used by get_hash()
+    strategies["get_hash"] = _hash_file
+    return strategies
+
+
+def format_size(size: int) -> str:
+    if size >= 1024**2:
+        return f"{size // 1024**2} MiB"
+    return f"{size // 1024} KiB"
+
+
+def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--total",
+        type=int,
+        default=256 * 1024**2,
+        help="Approximate number of bytes to hash per timing. Default: %(default)s",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parseargs(argv)
+    strategies = get_strategies()
+    print(f"{'size':>8} " + " ".join(f"{name:>15}" for name in strategies))
+    with TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = Path(tmp, str(size))
+            path.write_bytes(bytes(range(256)) * (size // 256))
+            expected = hashlib.sha256(path.read_bytes()).hexdigest()
+            number = max(1, args.total // size)
+            row = [f"{format_size(size):>8}"]
+            for func in strategies.values():
+                assert func(path) == expected
+                timer = timeit.Timer(partial(func, path))
+                per_call = min(timer.repeat(args.repeat, number)) / number
+                row.append(f"{per_call * 1e6:13.1f}us")
+            print(" ".join(row))
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
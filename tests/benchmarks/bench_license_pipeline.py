@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Time each stage of the license pipeline on a synthetic vendor tree.
+Results can be written to a JSON file and compared against a baseline from a
+previous run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from vendor_tree import VendorTree, generate_vendor_tree
+
+from go_vendor_tools import __version__
+from go_vendor_tools.license_detection.base import (
+    LicenseData,
+    get_manual_license_entries,
+)
+from go_vendor_tools.license_detection.search import find_license_files
+from go_vendor_tools.licensing import LicenseAccumulator, combine_licenses
+
+RESULTS_FORMAT_VERSION = 1
+
+
+def get_stages(tree: VendorTree) -> dict[str, Callable[[], object]]:
+    license_map = dict(tree.license_map)
+    expressions = list(license_map.values())
+    data = LicenseData(
+        directory=tree.directory,
+        license_map=license_map,
+        undetected_licenses=frozenset(),
+        unmatched_manual_licenses=(),
+        extra_license_files=(),
+        detector_name="benchmark",
+    )
+    return {
+        "find_license_files": partial(
+            find_license_files,
+            tree.directory,
+            True,
+            reuse_roots=tree.module_dirs,
+        ),
+        "get_manual_license_entries": partial(
+            get_manual_license_entries, tree.manual_licenses, tree.directory
+        ),
+        "combine_licenses": partial(combine_licenses, *expressions),
+        "LicenseAccumulator": lambda: LicenseAccumulator(expressions).expression,
+        "LicenseData.to_jsonable": lambda: LicenseData(
+            directory=tree.directory,
+            license_map=license_map,
+            undetected_licenses=frozenset(),
+            unmatched_manual_licenses=(),
+            extra_license_files=(),
+            detector_name="benchmark",
+        ).to_jsonable(),
+        "LicenseData.write_json": lambda: data.write_json(io.StringIO()),
+    }
+
+
+def time_stage(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    times = timeit.Timer(func).repeat(repeat, 1)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], max_ratio: float
+) -> bool:
+    """
+    Print a comparison of the `min` times in `results` and `baseline`
+
+    Returns:
+        Whether all of the stages are within `max_ratio` of the baseline
+    """
+    if results["params"] != baseline["params"]:
+        print(
+            "WARNING: The baseline was generated with different parameters:"
+            f" {baseline['params']}",
+            file=sys.stderr,
+        )
+    ok = True
+    print(f"{'stage':30} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, stats in results["stages"].items():
+        if name not in baseline["stages"]:
+            print(f"{name:30} {'-':>10} {stats['min']:10.4f} {'-':>7}")
+            continue
+        old = baseline["stages"][name]["min"]
+        ratio = stats["min"] / old
+        flag = ""
+        if ratio > max_ratio:
+            flag = " REGRESSION"
+            ok = False
+        print(f"{name:30} {old:10.4f} {stats['min']:10.4f} {ratio:6.2f}x{flag}")
+    return ok
+
+
+def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--stage",
+        dest="stages",
+        action="append",
+        help="Only run the specified stage. Can be passed multiple times.",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Write the results to a JSON file"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against results from a JSON file"
+    )
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=1.25,
+        help="Exit with an error if any stage is this many times slower than"
+        " the baseline. Default: %(default)s",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parseargs(argv)
+    results: dict[str, Any] = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "go_vendor_tools": __version__,
+        "python": platform.python_version(),
+        "params": {"modules": args.modules, "seed": args.seed, "repeat": args.repeat},
+        "stages": {},
+    }
+    with TemporaryDirectory() as tmp:
+        print(f"Generating a tree with {args.modules} modules...", file=sys.stderr)
+        tree = generate_vendor_tree(Path(tmp), args.modules, seed=args.seed)
+        found = find_license_files(tmp, True, reuse_roots=tree.module_dirs)
+        if set(map(Path, found["license"] + found["reuse"])) != set(tree.license_map):
+            sys.exit("ERROR: find_license_files() did not find the expected files!")
+        for name, func in get_stages(tree).items():
+            if args.stages and name not in args.stages:
+                continue
+            results["stages"][name] = stats = time_stage(func, args.repeat)
+            print(f"{name}: {stats['min']:.4f}s", file=sys.stderr)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if not compare(results, baseline, args.max_ratio):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the memory used by LicenseData's paths on a synthetic vendor tree
+with many license files.
+The paths are generated in memory; nothing is written to disk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from vendor_tree import generate_vendor_tree
+
+from go_vendor_tools.license_detection.base import LicenseData
+
+DIRECTORY = Path("/builddir/build/BUILD/project-1.0.0")
+
+
+def generate_license_map(files: int, seed: int = 0) -> dict[Path, str]:
+    # Every module has at least one license file
+    tree = generate_vendor_tree(DIRECTORY, files, seed=seed, write_files=False)
+    # Create a new string for each path like real detector output
+    return {
+        Path(str(path)): expression
+        for path, expression in list(tree.license_map.items())[:files]
+    }
+
+
+def plain_paths(
+    license_map: dict[Path, str], undetected: frozenset[Path]
+) -> tuple[object, ...]:
+    """
+    The paths as they were stored before LicenseData used a PathTable
+    """
+    license_file_paths = tuple(
+        sorted(DIRECTORY / path for path in [*license_map, *undetected])
+    )
+    return license_map, undetected, license_file_paths
+
+
+def license_data(
+    license_map: dict[Path, str], undetected: frozenset[Path]
+) -> LicenseData:
+    data = LicenseData(
+        directory=DIRECTORY,
+        license_map=license_map,
+        undetected_licenses=undetected,
+        unmatched_manual_licenses=(),
+        extra_license_files=(),
+        detector_name="benchmark",
+    )
+    # Compute the paths
+    len(data.license_file_paths)
+    return data
+
+
+def apply(func: Callable[..., object], inputs: Callable[[], tuple[Any, ...]]) -> object:
+    # The inputs are only freed if func() does not keep them alive
+    return func(*inputs())
+
+
+def measure(func: Callable[[], object]) -> int:
+    """
+    Returns:
+        Bytes allocated by `func` that are still in use after it returns
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument(
+        "--undetected-fraction",
+        type=float,
+        default=0.05,
+        help="Fraction of the files that are undetected. Default: %(default)s",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parseargs(argv)
+
+    def inputs() -> tuple[dict[Path, str], frozenset[Path]]:
+        license_map = generate_license_map(args.files, args.seed)
+        undetected = frozenset(
+            list(license_map)[: int(len(license_map) * args.undetected_fraction)]
+        )
+        for path in undetected:
+            del license_map[path]
+        return license_map, undetected
+
+    print(f"{args.files} license files")
+    for name, func in (
+        ("plain Paths", plain_paths),
+        ("LicenseData", license_data),
+    ):
+        size = measure(partial(apply, func, inputs))
+        print(
+            f"{name:15} {size / 1024 / 1024:8.2f} MiB {size / args.files:8.0f} B/file"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Compare parsing the per-file license expressions from license detector
+reports with and without the single license key fast path.
+Reports are JSON files written by `go_vendor_license report --write-json`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from go_vendor_tools.licensing import (
+    _parse_single_key,
+    get_licensing,
+    get_symbol_table,
+    parse,
+    simplify_license,
+)
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_REPORTS = sorted(HERE.parent.glob("pytests/test_data/*/reports/*.json"))
+
+
+def load_expressions(reports: list[Path]) -> list[str]:
+    expressions: list[str] = []
+    for report in reports:
+        data = json.loads(report.read_text())
+        expressions.extend(filter(None, data["license_map"].values()))
+    return expressions
+
+
+def full_parser(expressions: list[str]) -> Callable[[], object]:
+    licensing = get_licensing()
+
+    def func() -> None:
+        for expression in expressions:
+            licensing.parse(expression, validate=False, strict=False)
+
+    return func
+
+
+def fast_path(expressions: list[str]) -> Callable[[], object]:
+    licensing = get_licensing()
+
+    def func() -> None:
+        for expression in expressions:
+            if _parse_single_key(expression, False) is None:
+                licensing.parse(expression, validate=False, strict=False)
+
+    return func
+
+
+def uncached_simplify(expressions: list[str]) -> Callable[[], object]:
+    def func() -> None:
+        for expression in expressions:
+            simplify_license.cache_clear()  # type: ignore[attr-defined]
+            parse.cache_clear()  # type: ignore[attr-defined]
+            simplify_license(expression, validate=False, strict=False)
+
+    return func
+
+
+def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "reports",
+        nargs="*",
+        type=Path,
+        default=DEFAULT_REPORTS,
+        help="Default: the reports in the test data",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=200,
+        help="Number of times to parse all of the expressions per repeat",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parseargs(argv)
+    expressions = load_expressions(args.reports)
+    # Build the Licensing object, tokenizer automaton, and symbol table up
+    # front so they're not part of the timings
+    full_parser(expressions)()
+    get_symbol_table()
+    single = sum(_parse_single_key(expr, False) is not None for expr in expressions)
+    print(
+        f"{len(expressions)} expressions from {len(args.reports)} reports;"
+        f" {single} handled by the fast path"
+    )
+    strategies = {
+        "full parser": full_parser(expressions),
+        "fast path": fast_path(expressions),
+        "simplify_license (uncached)": uncached_simplify(expressions),
+    }
+    total = len(expressions) * args.number
+    for name, func in strategies.items():
+        best = min(timeit.Timer(func).repeat(args.repeat, args.number))
+        print(f"{name:30} {best / total * 1e6:8.2f} us/expression")
+
+
+if __name__ == "__main__":
+    main()
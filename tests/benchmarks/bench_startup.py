@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the startup time of go_vendor_license subcommands that run in every
+RPM build and the import time of go_vendor_tools modules
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+import timeit
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+MODULES = (
+    "go_vendor_tools.licensing",
+    "go_vendor_tools.license_detection.base",
+    "go_vendor_tools.cli.go_vendor_license",
+)
+IMPORTTIME_REGEX = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$")
+
+
+def get_import_time(module: str) -> int:
+    """
+    Returns:
+        Cumulative import time of `module` in microseconds
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    for line in proc.stderr.splitlines():
+        if (match := IMPORTTIME_REGEX.match(line)) and match[2] == module:
+            return int(match[1])
+    raise ValueError(f"No import time found for {module}")
+
+
+def get_commands(directory: Path) -> dict[str, list[str]]:
+    base = [sys.executable, "-m", "go_vendor_tools.cli.go_vendor_license"]
+    return {
+        "generate_buildrequires": [
+            *base,
+            "--detector=askalono",
+            "generate_buildrequires",
+        ],
+        "install": [
+            *base,
+            f"-C{directory}",
+            "--detector=askalono",
+            "install",
+            f"--install-directory={directory / 'licenses'}",
+            f"--destdir={directory / 'destdir'}",
+            f"--filelist={directory / 'filelist'}",
+            "-M",
+        ],
+    }
+
+
+def parseargs(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parseargs(argv)
+    print(f"{'module':45} {'import (ms)':>12}")
+    for module in MODULES:
+        import_time = min(get_import_time(module) for _ in range(args.repeat))
+        print(f"{module:45} {import_time / 1000:12.1f}")
+    print()
+    print(f"{'command':45} {'wall (ms)':>12}")
+    with TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        (directory / "LICENSE").write_text("MIT License\n")
+        for name, cmd in get_commands(directory).items():
+            timer = timeit.Timer(
+                partial(
+                    subprocess.run, cmd, check=True, capture_output=True, cwd=directory
+                )
+            )
+            wall_time = min(timer.repeat(args.repeat, 1))
+            print(f"{name:45} {wall_time * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
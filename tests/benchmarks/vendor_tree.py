@@ -0,0 +1,146 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+"""
+Generate reproducible synthetic Go vendor trees for the benchmarks
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import random
+from pathlib import Path
+
+from go_vendor_tools.config.licenses import LicenseEntry
+
+# Weighted roughly after what's common in the Go ecosystem
+LICENSES: dict[str, int] = {
+    "Apache-2.0": 40,
+    "MIT": 30,
+    "BSD-3-Clause": 15,
+    "BSD-2-Clause": 5,
+    "ISC": 4,
+    "MPL-2.0": 4,
+    "Unlicense": 2,
+}
+GO_FILES = ("doc.go", "main.go", "main_test.go", "util.go")
+OTHER_FILES = ("README.md", "CHANGELOG.md", ".gitignore", "go.mod")
+SUBDIRS = ("internal", "pkg/sub", "cmd/tool")
+
+
+def license_text(expression: str, lines: int = 40) -> str:
+    """
+    Return a fake license text.
+    Every module with the same license gets the exact same text, as is the
+    case with real vendor trees.
+    """
+    return "".join(
+        f"{expression} license text, line {line}.\n" for line in range(lines)
+    )
+
+
+@dataclasses.dataclass()
+class VendorTree:
+    """
+    Attributes:
+        directory: Top-level directory
+        module_dirs: Paths to the module directories relative to `directory`
+        license_map: License files relative to `directory` to expressions
+        manual_licenses: Manual license entries for a subset of license_map
+        write_files:
+            Whether to write the files to disk or only record the license
+            files in memory
+    """
+
+    directory: Path
+    module_dirs: list[Path] = dataclasses.field(default_factory=list)
+    license_map: dict[Path, str] = dataclasses.field(default_factory=dict)
+    manual_licenses: list[LicenseEntry] = dataclasses.field(default_factory=list)
+    write_files: bool = True
+
+    def write(self, relpath: Path | str, text: str = "") -> Path:
+        path = self.directory / relpath
+        if self.write_files:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        return path
+
+    def write_license(self, relpath: Path, expression: str) -> None:
+        self.write(relpath, license_text(expression))
+        self.license_map[relpath] = expression
+
+
+def generate_vendor_tree(
+    directory: Path,
+    modules: int = 2000,
+    *,
+    seed: int = 0,
+    reuse_fraction: float = 0.05,
+    notice_fraction: float = 0.2,
+    dual_fraction: float = 0.1,
+    manual_fraction: float = 0.05,
+    write_files: bool = True,
+) -> VendorTree:
+    """
+    Generate a synthetic vendor tree.
+    The same arguments always produce the same tree.
+
+    Args:
+        directory: Existing (empty) directory to populate
+        modules: Number of vendored modules
+        seed: Random seed
+        reuse_fraction:
+            Fraction of modules that use REUSE-style LICENSES directories
+        notice_fraction: Fraction of modules that have a NOTICE file
+        dual_fraction:
+            Fraction of modules that have two license files (LICENSE-MIT and
+            LICENSE-APACHE)
+        manual_fraction:
+            Fraction of modules with a manual license entry for their license
+            file
+        write_files:
+            Whether to write the tree to `directory`.
+            When False, only the returned VendorTree is built.
+    """
+    rng = random.Random(seed)
+    tree = VendorTree(directory, write_files=write_files)
+    names, weights = list(LICENSES), list(LICENSES.values())
+    tree.write("go.mod", "module example.com/project\n")
+    tree.write("main.go", "package main\n")
+    tree.write_license(Path("LICENSE"), "Apache-2.0")
+    modules_txt: list[str] = []
+    for index in range(modules):
+        ipath = f"example.com/org{index % 100}/mod{index}"
+        version = f"1.{rng.randrange(20)}.{rng.randrange(10)}"
+        modules_txt.append(f"# {ipath} v{version}\n## explicit; go 1.21\n{ipath}\n")
+        module = Path("vendor", ipath)
+        tree.module_dirs.append(module)
+        for subdir in ("", *SUBDIRS):
+            for name in GO_FILES:
+                tree.write(module / subdir / name, "package mod\n")
+        for name in OTHER_FILES:
+            tree.write(module / name)
+        expression = rng.choices(names, weights)[0]
+        if rng.random() < reuse_fraction:
+            tree.write_license(module / "LICENSES" / f"{expression}.txt", expression)
+        elif rng.random() < dual_fraction:
+            tree.write_license(module / "LICENSE-MIT", "MIT")
+            tree.write_license(module / "LICENSE-APACHE", "Apache-2.0")
+        else:
+            tree.write_license(module / "LICENSE", expression)
+            if rng.random() < manual_fraction:
+                path = module / "LICENSE"
+                tree.manual_licenses.append(
+                    {
+                        "path": str(path),
+                        "sha256sum": hashlib.sha256(
+                            license_text(expression).encode("utf-8")
+                        ).hexdigest(),
+                        "expression": expression,
+                    }
+                )
+        if rng.random() < notice_fraction:
+            tree.write(module / "NOTICE", f"Copyright {ipath} authors\n")
+    tree.write("vendor/modules.txt", "".join(modules_txt))
+    return tree
@@ -3,11 +3,12 @@
 
 from __future__ import annotations
 
+import json
 import re
 import sys
 from io import StringIO
 from pathlib import Path
-from shutil import copy2
+from shutil import copy2, copytree
 from textwrap import dedent
 
 import pytest
@@ -18,8 +19,21 @@ from go_vendor_tools.config.base import BaseConfig
 from go_vendor_tools.exceptions import MissingDependencyError
 from go_vendor_tools.license_detection.base import (
     LicenseData,
+    LicenseDetector,
     LicenseDetectorNotAvailableError,
 )
+from go_vendor_tools.license_detection.cache import (
+    CACHE_FILE_NAME,
+    LICENSE_DATA_CACHE_FILE_NAME,
+    DetectionCache,
+    get_default_cache_path,
+)
+from go_vendor_tools.licensing import (
+    DEFAULT_EXPRESSION_CACHE_SIZE,
+    get_expression_cache_info,
+    set_expression_cache_size,
+    simplify_license,
+)
 
 if sys.version_info >= (3, 11):
     import tomllib
@@ -178,6 +192,40 @@ def test_generate_buildrequires_no_check_trivy(capsys: pytest.CaptureFixture):
     assert out == "trivy\n"
 
 
+def test_expression_cache_options(
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+) -> None:
+    monkeypatch.setattr(
+        go_vendor_license,
+        "choose_license_detector",
+        lambda *args: (mocker.Mock(NAME="mock"), None),
+    )
+    monkeypatch.setattr(
+        go_vendor_license, "report_command", lambda args: simplify_license("MIT")
+    )
+    try:
+        go_vendor_license.main(
+            [
+                "--no-cache",
+                "--expression-cache-size=unbounded",
+                "report",
+                "--expression-cache-stats",
+            ]
+        )
+        assert all(
+            info.maxsize is None for info in get_expression_cache_info().values()
+        )
+    finally:
+        set_expression_cache_size(DEFAULT_EXPRESSION_CACHE_SIZE)
+    _, err = capsys.readouterr()
+    assert "License expression cache statistics:" in err
+    assert re.search(r"- simplify_license: \d+ hits, \d+ misses", err)
+    with pytest.raises(SystemExit):
+        go_vendor_license.parseargs(["--expression-cache-size=-1", "report"])
+
+
 def test_license_explicit(test_data: Path, tmp_path: Path) -> None:
     case_dir = test_data / "case1"
     licenses_dir = case_dir / "licenses"
@@ -197,3 +245,304 @@ def test_license_explicit(test_data: Path, tmp_path: Path) -> None:
     with open(dest, "rb") as fp:
         gotten = tomllib.load(fp)
     assert gotten == expected
+
+
+@pytest.mark.parametrize("input_format", ["args", "tsv", "json"])
+def test_license_explicit_bulk(
+    test_data: Path, tmp_path: Path, input_format: str
+) -> None:
+    case_dir = test_data / "case1"
+    licenses_dir = case_dir / "licenses"
+    with open(case_dir / "config.toml", "rb") as fp:
+        expected = tomllib.load(fp)
+    dest = tmp_path / "config.toml"
+    entries = [
+        (licenses_dir / "LICENSE.MIT", "MIT"),
+        (licenses_dir / "LICENSE.BSD3", "BSD-3-Clause"),
+    ]
+    if input_format == "args":
+        args = [arg for path, expr in entries for arg in ("-f", str(path), expr)]
+    elif input_format == "tsv":
+        input_file = tmp_path / "licenses.tsv"
+        input_file.write_text(
+            "# path\texpression\n\n"
+            + "".join(f"{path}\t{expr}\n" for path, expr in entries)
+        )
+        args = ["--input", str(input_file)]
+    else:
+        input_file = tmp_path / "licenses.json"
+        input_file.write_text(
+            json.dumps([{"path": str(path), "expression": e} for path, e in entries])
+        )
+        args = ["--input", str(input_file)]
+    go_vendor_license.main([f"-c{dest}", f"-C{licenses_dir}", "explicit", *args])
+    with open(dest, "rb") as fp:
+        gotten = tomllib.load(fp)
+    assert gotten == expected
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        pytest.param(
+            ["-f", "LICENSE.MIT", "-f", "LICENSE.BSD3", "MIT"],
+            "No license expression for --file LICENSE.MIT",
+            id="shared-expression",
+        ),
+        pytest.param(
+            ["-fLICENSE.MIT", "-fLICENSE.BSD3", "MIT"],
+            "Got a license expression argument but 2 --file arguments without"
+            " an expression",
+            id="shared-expression-argument",
+        ),
+        pytest.param(
+            ["-f", "LICENSE.MIT", "MIT", "-f", "LICENSE.BSD3"],
+            "No license expression for --file LICENSE.BSD3",
+            id="missing-expression",
+        ),
+        pytest.param(
+            ["-f", "LICENSE.MIT", "-f", "LICENSE.BSD3", "MIT", "BSD-3-Clause"],
+            "--file LICENSE.BSD3: Expected one license expression but got 2",
+            id="separate-expressions",
+        ),
+        pytest.param(
+            ["-f", "LICENSE.MIT", "MIT", "AND", "ISC"],
+            "--file LICENSE.MIT: Expected one license expression but got 3",
+            id="unquoted-expression",
+        ),
+    ],
+)
+def test_license_explicit_mismatched(
+    test_data: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    args: list[str],
+    message: str,
+) -> None:
+    licenses_dir = test_data / "case1/licenses"
+    monkeypatch.chdir(licenses_dir)
+    with pytest.raises(SystemExit, match=re.escape(message)):
+        go_vendor_license.main(
+            [f"-c{tmp_path / 'config.toml'}", f"-C{licenses_dir}", "explicit", *args]
+        )
+    assert not (tmp_path / "config.toml").exists()
+
+
+def test_license_explicit_expressions_without_files(
+    test_data: Path, tmp_path: Path
+) -> None:
+    licenses_dir = test_data / "case1/licenses"
+    input_file = tmp_path / "licenses.tsv"
+    input_file.write_text(f"{licenses_dir / 'LICENSE.MIT'}\tMIT\n")
+    with pytest.raises(
+        SystemExit, match="Got a license expression without any --file arguments"
+    ):
+        go_vendor_license.main(
+            [
+                f"-c{tmp_path / 'config.toml'}",
+                f"-C{licenses_dir}",
+                "explicit",
+                f"--input={input_file}",
+                "MIT",
+            ]
+        )
+    assert not (tmp_path / "config.toml").exists()
+
+
+def test_install_reuse_json(
+    test_data: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    detector: type[LicenseDetector],
+) -> None:
+    config = test_data / "case1" / "config.toml"
+    directory = tmp_path / "src"
+    copytree(test_data / "case1" / "licenses", directory)
+    monkeypatch.chdir(directory)
+    data_file = tmp_path / "data.json"
+    base_args = [f"-c{config}", f"--detector={detector.NAME}", "--no-cache"]
+    go_vendor_license.main(
+        [
+            *base_args,
+            "install",
+            "--install-directory=/usr/share/licenses/foo",
+            f"--destdir={tmp_path / 'destdir'}",
+            f"--filelist={tmp_path / 'filelist'}",
+            "-M",
+            f"--write-json={data_file}",
+        ]
+    )
+    assert (tmp_path / "filelist").read_text() == dedent("""\
+        %license %dir /usr/share/licenses/foo
+        %license /usr/share/licenses/foo/LICENSE.BSD3
+        %license /usr/share/licenses/foo/LICENSE.MIT
+        """)
+    data = json.loads(data_file.read_text())
+    assert data["license_expression"] == "BSD-3-Clause AND MIT"
+    # trivy's inputs cannot be fingerprinted
+    assert bool(data.get("input_fingerprint")) is (detector.NAME != "trivy")
+    capsys.readouterr()
+
+    report_args = [
+        *base_args,
+        "report",
+        "expression",
+        f"--reuse-json={data_file}",
+        "--verify=BSD-3-Clause AND MIT",
+    ]
+    with pytest.raises(SystemExit) as exc:
+        go_vendor_license.main(report_args)
+    assert not exc.value.code
+    out, err = capsys.readouterr()
+    assert out == "BSD-3-Clause AND MIT\n"
+    if detector.NAME == "trivy":
+        assert "trivy detector's inputs cannot be fingerprinted" in err
+        return
+    assert f"Reusing license data from {data_file}" in err
+
+    # The data can be reused for an identical tree in a different location
+    other = tmp_path / "other"
+    copytree(directory, other)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as exc:
+        go_vendor_license.main([f"-C{other}", *report_args])
+    assert not exc.value.code
+    out, err = capsys.readouterr()
+    assert out == "BSD-3-Clause AND MIT\n"
+    assert f"Reusing license data from {data_file}" in err
+    monkeypatch.chdir(directory)
+
+    # A new license file is detected again
+    new_license = directory / "vendor/example.com/foo/LICENSE"
+    new_license.parent.mkdir(parents=True)
+    new_license.write_text("Custom license\n")
+    with pytest.raises(SystemExit):
+        go_vendor_license.main(report_args)
+    _, err = capsys.readouterr()
+    assert "Not reusing license data from" in err
+    new_license.unlink()
+
+    # A changed license file is detected again
+    (directory / "LICENSE.MIT").write_text("changed\n")
+    with pytest.raises(SystemExit):
+        go_vendor_license.main(report_args)
+    _, err = capsys.readouterr()
+    assert "Not reusing license data from" in err
+
+
+def test_install_write_json_files(
+    test_data: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    detector: type[LicenseDetector],
+) -> None:
+    config = test_data / "case1" / "config.toml"
+    directory = tmp_path / "src"
+    copytree(test_data / "case1" / "licenses", directory)
+    monkeypatch.chdir(directory)
+    # askalono's detect() excludes undetected files in testdata directories,
+    # but find_license_files() returns them
+    testdata = directory / "vendor/example.com/foo/testdata/LICENSE"
+    testdata.parent.mkdir(parents=True)
+    testdata.write_text("Custom license\n")
+    filelists: list[str] = []
+    for extra_args in ([], [f"--write-json={tmp_path / 'data.json'}"]):
+        filelist = tmp_path / "filelist"
+        go_vendor_license.main(
+            [
+                f"-c{config}",
+                f"--detector={detector.NAME}",
+                "--no-cache",
+                "install",
+                "--install-directory=/usr/share/licenses/foo",
+                f"--destdir={tmp_path / 'destdir'}",
+                f"--filelist={filelist}",
+                "-M",
+                *extra_args,
+            ]
+        )
+        filelists.append(filelist.read_text())
+    assert filelists[0] == filelists[1]
+
+
+def test_report_cache_dir(
+    test_data: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+    detector: type[LicenseDetector],
+) -> None:
+    config = test_data / "case1" / "config.toml"
+    monkeypatch.chdir(test_data / "case1" / "licenses")
+    cache_dir = tmp_path / "cache"
+    close = mocker.spy(DetectionCache, "close")
+    with pytest.raises(SystemExit) as exc:
+        go_vendor_license.main(
+            [
+                f"-c{config}",
+                f"--detector={detector.NAME}",
+                f"--cache-dir={cache_dir}",
+                "report",
+                "expression",
+                "--verify=BSD-3-Clause AND MIT",
+            ]
+        )
+    assert not exc.value.code
+    assert sorted(path.name for path in cache_dir.glob("*.sqlite3")) == [
+        LICENSE_DATA_CACHE_FILE_NAME,
+        CACHE_FILE_NAME,
+    ]
+    # Both caches are closed
+    assert close.call_count == 2
+
+
+def test_report_memoized(
+    test_data: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    detector: type[LicenseDetector],
+) -> None:
+    config = test_data / "case1" / "config.toml"
+    directory = tmp_path / "src"
+    copytree(test_data / "case1" / "licenses", directory)
+    monkeypatch.chdir(directory)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    walks: list[object] = []
+    iter_license_files = LicenseDetector._iter_license_files
+
+    def _iter_license_files(self, *args, **kwargs):
+        walks.append(args)
+        return iter_license_files(self, *args, **kwargs)
+
+    monkeypatch.setattr(LicenseDetector, "_iter_license_files", _iter_license_files)
+    report_args = [
+        f"-c{config}",
+        f"--detector={detector.NAME}",
+        "report",
+        "expression",
+        "--verify=BSD-3-Clause AND MIT",
+    ]
+    for _ in range(2):
+        with pytest.raises(SystemExit) as exc:
+            go_vendor_license.main(report_args)
+        assert not exc.value.code
+        # detect() reuses the license files found while fingerprinting
+        assert len(walks) == 1
+        walks.clear()
+    out, err = capsys.readouterr()
+    assert out == "BSD-3-Clause AND MIT\n" * 2
+    memoized = "Using memoized license data" in err
+    # trivy's inputs cannot be fingerprinted
+    assert memoized is (detector.NAME != "trivy")
+    # Whole-package license data has its own cache with its own size budget
+    with DetectionCache(get_default_cache_path(LICENSE_DATA_CACHE_FILE_NAME)) as cache:
+        assert len(cache) == int(memoized)
+
+    # A changed license file is detected again
+    (directory / "LICENSE.MIT").write_text("changed\n")
+    with pytest.raises(SystemExit):
+        go_vendor_license.main(report_args)
+    _, err = capsys.readouterr()
+    assert "Using memoized license data" not in err
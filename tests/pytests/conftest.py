@@ -16,6 +16,12 @@ TEST_DATA = HERE / "test_data"
 CONFIG1 = load_config(TEST_DATA / "case1" / "config.toml")
 
 
+@pytest.fixture(autouse=True)
+def _user_cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch) -> None:
+    # Don't touch the real user cache directory
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+
+
 @pytest.fixture
 def test_data() -> Path:
     return TEST_DATA
@@ -0,0 +1,84 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from go_vendor_tools.license_detection.base import ContentDeduplicator
+from go_vendor_tools.license_detection.cache import (
+    LICENSE_DATA_CACHE_FILE_NAME,
+    DetectionCache,
+    get_cache_namespace,
+    get_default_cache_path,
+)
+
+
+def test_detection_cache(tmp_path: Path) -> None:
+    path = tmp_path / "cache/detection.sqlite3"
+    namespace = get_cache_namespace("askalono", "1.0", {"multiple": False})
+    with DetectionCache(path) as cache:
+        assert cache.get(namespace, "abc") is None
+        cache.put_many(namespace, [("abc", {"license": "MIT"}), ("def", None)])
+        assert cache.get(namespace, "abc") == {"license": "MIT"}
+        assert cache.get(get_cache_namespace("askalono", "1.1"), "abc") is None
+    # The results persist and can be shared between processes
+    with DetectionCache(path) as cache1, DetectionCache(path) as cache2:
+        assert cache1.get(namespace, "abc") == {"license": "MIT"}
+        cache2.put_many(namespace, [("ghi", "Apache-2.0")])
+        assert cache1.get(namespace, "ghi") == "Apache-2.0"
+        assert len(cache1) == 3
+
+
+def test_detection_cache_key_order(tmp_path: Path) -> None:
+    # Cached results must be identical to the detector's output
+    result = {"score": 1.0, "license": {"name": "MIT", "kind": "original"}}
+    with DetectionCache(tmp_path / "detection.sqlite3") as cache:
+        cache.put_many("ns", [("abc", result)])
+        cached = cache.get("ns", "abc")
+    assert cached is not None
+    assert list(cached) == ["score", "license"]
+    assert list(cached["license"]) == ["name", "kind"]
+
+
+def test_detection_cache_eviction(tmp_path: Path) -> None:
+    with DetectionCache(tmp_path / "detection.sqlite3", max_size=100) as cache:
+        cache.put_many("ns", [("old", "x" * 40)])
+        cache.put_many("ns", [("new", "x" * 40)])
+        # Mark the oldest entry as recently used
+        assert cache.get("ns", "old")
+        cache.put_many("ns", [("newest", "x" * 40)])
+        assert cache.get("ns", "old")
+        assert cache.get("ns", "new") is None
+        assert cache.get("ns", "newest")
+
+
+def test_detection_cache_default_path(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert get_default_cache_path().parent == tmp_path / "go-vendor-tools"
+    # Whole-package license data has its own cache file
+    assert (
+        get_default_cache_path(LICENSE_DATA_CACHE_FILE_NAME).parent
+        == get_default_cache_path().parent
+    )
+    assert get_default_cache_path(LICENSE_DATA_CACHE_FILE_NAME) != (
+        get_default_cache_path()
+    )
+
+
+def test_content_deduplicator_cache(tmp_path: Path) -> None:
+    for name, text in (("a", "MIT"), ("b", "MIT"), ("c", "ISC"), ("d", "BSD")):
+        (tmp_path / name).write_text(text)
+    with DetectionCache(tmp_path / "detection.sqlite3") as cache:
+        dedup = ContentDeduplicator[str](tmp_path, cache, "ns")
+        assert list(dedup.unique(["a", "b", "c"])) == ["a", "c"]
+        assert dedup.fan_out({"a": "MIT", "c": "ISC"}) == {
+            "a": "MIT",
+            "b": "MIT",
+            "c": "ISC",
+        }
+        dedup = ContentDeduplicator[str](tmp_path, cache, "ns")
+        # Only files without a cached result are passed on
+        assert list(dedup.unique(["b", "c", "d"])) == ["d"]
+        assert dedup.fan_out({"d": "BSD"}) == {"b": "MIT", "c": "ISC", "d": "BSD"}
+        assert len(cache) == 3
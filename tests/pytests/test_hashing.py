@@ -0,0 +1,112 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from go_vendor_tools import hashing
+from go_vendor_tools.hashing import (
+    BUFFER_SIZE,
+    get_hash,
+    get_hashes,
+    hash_memo,
+    verify_hash,
+    verify_hashes,
+)
+
+
+@pytest.mark.parametrize("size", [0, 1, BUFFER_SIZE, BUFFER_SIZE * 2 + 17])
+def test_get_hash(tmp_path: Path, size: int) -> None:
+    data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    path = tmp_path / "file"
+    path.write_bytes(data)
+    assert get_hash(path) == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("jobs", [None, 1, 4])
+def test_get_hashes(tmp_path: Path, jobs: int | None) -> None:
+    files: list[Path] = []
+    for index in range(10):
+        path = tmp_path / f"file{index}"
+        path.write_text(f"contents {index}\n")
+        files.append(path)
+    missing = tmp_path / "missing"
+    result = get_hashes([*files, files[0], missing, tmp_path], jobs)
+    assert list(result) == [*files, missing, tmp_path]
+    for path in files:
+        assert result[path] == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert result[missing] is None
+    assert result[tmp_path] is None
+
+
+def test_verify_hashes(tmp_path: Path) -> None:
+    path = tmp_path / "file"
+    path.write_text("abc")
+    digest = get_hash(path)
+    entries = [
+        (path, digest),
+        (path, "0" * 64),
+        (tmp_path / "missing", digest),
+        (tmp_path, digest),
+    ]
+    expected = [verify_hash(file, sha256sum) for file, sha256sum in entries]
+    assert expected == [True, False, False, False]
+    assert verify_hashes(entries) == expected
+
+
+def test_hash_memo(tmp_path: Path, mocker: MockerFixture) -> None:
+    memo_path = tmp_path / "build/hashes.json"
+    path = tmp_path / "LICENSE"
+    path.write_text("MIT")
+    old_time = time.time() - 60
+    os.utime(path, (old_time, old_time))
+    expected = hashlib.sha256(b"MIT").hexdigest()
+    hash_file = mocker.spy(hashing, "_hash_file")
+
+    with hash_memo(memo_path):
+        assert get_hash(path) == expected
+        assert verify_hash(path, expected)
+    assert hash_file.call_count == 1
+    assert memo_path.is_file()
+
+    # The memo is persisted between runs
+    with hash_memo(memo_path):
+        assert get_hashes([path]) == {path: expected}
+    assert hash_file.call_count == 1
+
+    # Changing the file invalidates the entry
+    path.write_text("ISC")
+    os.utime(path, (old_time + 1, old_time + 1))
+    with hash_memo(memo_path):
+        assert get_hash(path) == hashlib.sha256(b"ISC").hexdigest()
+    assert hash_file.call_count == 2
+
+    # Without a memo, files are always hashed
+    assert get_hash(path) == hashlib.sha256(b"ISC").hexdigest()
+    assert hash_file.call_count == 3
+
+
+def test_hash_memo_racy(tmp_path: Path, mocker: MockerFixture) -> None:
+    path = tmp_path / "LICENSE"
+    path.write_text("MIT")
+    hash_file = mocker.spy(hashing, "_hash_file")
+    with hash_memo(tmp_path / "hashes.json"):
+        get_hash(path)
+        get_hash(path)
+    # Recently modified files are not memoized
+    assert hash_file.call_count == 2
+
+
+def test_get_hash_mmap_fallback(tmp_path: Path, mocker: MockerFixture) -> None:
+    data = b"x" * hashing.MMAP_THRESHOLD
+    path = tmp_path / "file"
+    path.write_bytes(data)
+    mocker.patch.object(hashing, "_hash_mmap", side_effect=OSError)
+    assert get_hash(path) == hashlib.sha256(data).hexdigest()
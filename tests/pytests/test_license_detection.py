@@ -3,7 +3,11 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
 import json
+import sys
+import time
 from pathlib import Path
 from subprocess import CalledProcessError
 from typing import Any
@@ -12,14 +16,30 @@ import pytest
 from pytest_mock import MockerFixture
 
 from go_vendor_tools.config.base import BaseConfig, load_config
+from go_vendor_tools.config.licenses import create_license_config
+from go_vendor_tools.exceptions import ConfigError
+from go_vendor_tools.license_detection import base
 from go_vendor_tools.license_detection.askalono import AskalonoLicenseDetector
 from go_vendor_tools.license_detection.base import (
+    ContentDeduplicator,
+    ExclusionMatcher,
+    FileHashStore,
     LicenseData,
     LicenseDetector,
+    file_hash_store,
+    get_file_hash_store,
     get_manual_license_entries,
+    is_unwanted_path,
 )
 from go_vendor_tools.license_detection.load import DETECTORS
-from go_vendor_tools.license_detection.trivy import TrivyLicenseDetector
+from go_vendor_tools.license_detection.pathtable import PathMap, PathSet
+from go_vendor_tools.license_detection.scancode import ScancodeLicenseData
+from go_vendor_tools.license_detection.trivy import (
+    TrivyLicenseDetector,
+    _trivy_license_dict_to_license_map,
+    run_read_json,
+)
+from go_vendor_tools.licensing import combine_licenses
 
 
 def test_get_extra_licenses(test_data: Path) -> None:
@@ -94,6 +114,9 @@ def test_load_dump_license_data(
     jsonable = data.to_jsonable()
     new_data = type(data).from_jsonable(jsonable)
     assert new_data.to_jsonable() == jsonable
+    buffer = io.StringIO()
+    data.write_json(buffer)
+    assert buffer.getvalue() == json.dumps(jsonable, indent=2)
 
     _remove_license_scanner_data(jsonable)
     # NOTE: Uncomment this line to regenerate the test fixtures
@@ -129,6 +152,25 @@ def test_detect_nothing(tmp_path: Path, detector: type[LicenseDetector]) -> None
     assert data.license_expression is None
 
 
+def test_scan_inputs(detector: type[LicenseDetector], test_data: Path) -> None:
+    directory = test_data / "case1/licenses"
+    fingerprints = set()
+    for jobs in (1, 4):
+        detector_obj = detector({}, create_license_config({"search_jobs": jobs}))
+        inputs = detector_obj.scan_inputs(directory)
+        if detector is TrivyLicenseDetector:
+            # trivy's inputs cannot be fingerprinted
+            assert inputs is None
+            return
+        assert inputs is not None
+        assert inputs.license_file_lists["license"] == ["LICENSE.BSD3", "LICENSE.MIT"]
+        fingerprints.add(inputs.fingerprint)
+    # The number of search jobs doesn't change the results
+    assert len(fingerprints) == 1
+    other = detector({}, create_license_config({"exclude_files": ["LICENSE.MIT"]}))
+    assert other.scan_inputs(directory) != inputs
+
+
 def test_detect_files(detector: type[LicenseDetector], test_data: Path) -> None:
     if detector is TrivyLicenseDetector:
         pytest.skip("trivy is not supported")
@@ -172,3 +214,299 @@ def test_detect_files_absolute(
     expected_undetected = {files[2]}
     assert mapping == expected_mapping
     assert undetected == expected_undetected
+
+
+def test_license_config_search_mode_invalid() -> None:
+    with pytest.raises(ConfigError, match="search_mode: 'abc'"):
+        create_license_config({"search_mode": "abc"})
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "LICENSE",
+        "vendor/example.com/a/LICENSE",
+        "vendor/example.com/a",
+        "vendor/example.com/ab/LICENSE",
+        "vendor/example.com/b/c/LICENSE",
+        "vendor/example.com/b/LICENSE",
+        "vendor/example.com/testdata/LICENSE",
+        "internal/testdata",
+        "docs/COPYING",
+        "docs/COPYING.md",
+        "docs",
+    ],
+)
+def test_exclusion_matcher(path: str) -> None:
+    exclude_directories = ["vendor/example.com/a", "vendor/example.com/b/c/"]
+    exclude_files = ["docs/COPYING"]
+    expected = (
+        "testdata" in Path(path).parts
+        or path in exclude_files
+        or any(Path(path).is_relative_to(d) for d in exclude_directories)
+    )
+    matcher = ExclusionMatcher(exclude_directories, exclude_files)
+    assert matcher(Path(path)) is expected
+    assert is_unwanted_path(Path(path), exclude_directories, exclude_files) is expected
+
+
+def test_exclusion_matcher_everything() -> None:
+    matcher = ExclusionMatcher(["."])
+    assert matcher(Path("LICENSE"))
+    assert matcher(Path("vendor/example.com/a/LICENSE"))
+    assert not ExclusionMatcher()(Path("LICENSE"))
+
+
+def test_exclusion_matcher_globs() -> None:
+    matcher = ExclusionMatcher(exclude_globs=["vendor/example.com/*/docs/", "*.txt"])
+    assert matcher(Path("vendor/example.com/a/docs/LICENSE"))
+    assert matcher(Path("vendor/example.com/a/LICENSE.txt"))
+    assert not matcher(Path("vendor/example.com/a/LICENSE"))
+    assert not matcher(Path("docs/LICENSE"))
+
+
+def test_content_deduplicator(tmp_path: Path) -> None:
+    for name, text in (("a", "MIT"), ("b", "MIT"), ("c", "ISC"), ("d", "MIT")):
+        (tmp_path / name).write_text(text)
+    dedup = ContentDeduplicator[str](tmp_path)
+    assert list(dedup.unique(["a", "b", "c", "a", "d", "missing"])) == [
+        "a",
+        "c",
+        "missing",
+    ]
+    results = {"a": "MIT", "c": "ISC"}
+    assert dedup.fan_out(results) == {"a": "MIT", "b": "MIT", "c": "ISC", "d": "MIT"}
+
+
+def test_file_hash_store(tmp_path: Path, mocker: MockerFixture) -> None:
+    path = tmp_path / "LICENSE"
+    path.write_bytes(b"MIT")
+    store = FileHashStore()
+    hash_spy = mocker.spy(base, "get_hash")
+    assert path not in store
+    assert store.get_hash(path) == hashlib.sha256(b"MIT").hexdigest()
+    assert store.get_hash(path) == hashlib.sha256(b"MIT").hexdigest()
+    # The file was only hashed once
+    assert hash_spy.call_count == 1
+    assert path in store
+    assert store.verify_hashes(
+        [(path, hashlib.sha256(b"MIT").hexdigest()), (path, "0"), (tmp_path, "0")]
+    ) == [True, False, False]
+
+
+def test_file_hash_store_context() -> None:
+    assert get_file_hash_store() is not get_file_hash_store()
+    with file_hash_store() as store:
+        assert get_file_hash_store() is store
+        assert ContentDeduplicator[str]().store is store
+    assert get_file_hash_store() is not store
+
+
+def test_detect_files_duplicates(
+    detector: type[LicenseDetector], test_data: Path, tmp_path: Path
+) -> None:
+    if detector is TrivyLicenseDetector:
+        pytest.skip("trivy is not supported")
+    config = load_config(None)
+    detector_obj = detector({}, config["licensing"])
+    mit = (test_data / "case1/licenses/LICENSE.MIT").read_bytes()
+    undetected = (test_data / "case2/licenses/LICENSE.undetected").read_bytes()
+    files: list[Path] = []
+    for index in range(3):
+        (tmp_path / f"LICENSE{index}").write_bytes(mit)
+        (tmp_path / f"COPYING{index}").write_bytes(undetected)
+        files.extend((Path(f"LICENSE{index}"), Path(f"COPYING{index}")))
+    mapping, undetected_files = detector_obj.detect_files(files, tmp_path)
+    assert mapping == {Path(f"LICENSE{index}"): "MIT" for index in range(3)}
+    assert undetected_files == {Path(f"COPYING{index}") for index in range(3)}
+
+
+def test_run_read_json(tmp_path: Path) -> None:
+    done = tmp_path / "done"
+    # Write more than a pipe buffer before signaling that the command is done
+    script = (
+        "import json, pathlib, sys;"
+        " sys.stdout.write(json.dumps(['x' * 1024] * 1024));"
+        " sys.stdout.flush();"
+        f" pathlib.Path({str(done)!r}).touch()"
+    )
+
+    def wait_for_done() -> int:
+        for _ in range(3000):
+            if done.exists():
+                return 1
+            time.sleep(0.01)
+        raise AssertionError("The command blocked while while_running was running")
+
+    data, result = run_read_json([sys.executable, "-c", script], wait_for_done)
+    assert data == ["x" * 1024] * 1024
+    assert result == 1
+
+    with pytest.raises(CalledProcessError) as exc:
+        run_read_json(
+            [sys.executable, "-c", "import sys; sys.exit('failed')"], lambda: None
+        )
+    assert exc.value.stderr == "failed\n"
+
+
+def test_trivy_license_map_multiple_matches() -> None:
+    data: Any = {
+        "Licenses": [
+            {"FilePath": "LICENSE", "Name": "MIT"},
+            {"FilePath": "LICENSE", "Name": "Apache-2.0 OR MIT"},
+            {"FilePath": "LICENSE", "Name": "MIT"},
+            {"FilePath": "COPYING", "Name": "BSD-3-Clause"},
+            {"FilePath": "NOTICE", "Name": "not a license"},
+        ]
+    }
+    license_map, invalid = _trivy_license_dict_to_license_map(
+        data, create_license_config()
+    )
+    assert license_map == {
+        Path("LICENSE"): "MIT AND (Apache-2.0 OR MIT)",
+        Path("COPYING"): "BSD-3-Clause",
+    }
+    assert invalid == {Path("NOTICE")}
+
+
+def test_license_data_lazy(mocker: MockerFixture) -> None:
+    directory = Path("/vendor")
+    data = LicenseData(
+        directory=directory,
+        license_map={Path("a/LICENSE"): "MIT", Path("b/LICENSE"): "Apache-2.0"},
+        undetected_licenses=frozenset({Path("c/COPYING")}),
+        unmatched_manual_licenses=(),
+        extra_license_files=(),
+        detector_name="test",
+    )
+    assert "license_expression" not in vars(data)
+    assert data.license_expression == "Apache-2.0 AND MIT"
+    assert "license_expression" in vars(data)
+    with pytest.raises(AttributeError):
+        data.nonexistent  # noqa: B018
+
+    get_unknown = mocker.patch(
+        "go_vendor_tools.license_detection.base.get_unknown_license_keys",
+        return_value=[],
+    )
+    assert data.is_valid_license
+    assert data.license_file_paths == (
+        directory / "a/LICENSE",
+        directory / "b/LICENSE",
+        directory / "c/COPYING",
+    )
+
+    # Same files and expressions: everything is reused
+    same = data.replace(detector_name="other")
+    assert same.license_file_paths is data.license_file_paths
+    assert same.license_expression is data.license_expression
+    assert same.is_valid_license
+    # Same set of expressions with a different file
+    moved = data.replace(
+        license_map={Path("a/LICENSE"): "MIT", Path("d/LICENSE"): "Apache-2.0"}
+    )
+    assert "license_file_paths" not in vars(moved)
+    assert moved.license_expression is data.license_expression
+    assert moved.license_file_paths[1] == directory / "c/COPYING"
+    # Different expressions are recalculated
+    changed = data.replace(license_map={Path("a/LICENSE"): "BSD-3-Clause"})
+    assert changed.license_expression == "BSD-3-Clause"
+    assert changed.is_valid_license
+    assert get_unknown.call_count == 2
+    assert changed.to_jsonable()["license_file_paths"] == [
+        str(directory / "a/LICENSE"),
+        str(directory / "c/COPYING"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "expressions",
+    [
+        pytest.param(
+            [
+                "(((ISC OR MPL-2.0) AND (MPL-2.0 OR GPL-2.0-only)) OR"
+                " (LicenseRef-Fedora-Public-Domain OR (BSD-2-Clause OR BSD-3-Clause)))"
+            ],
+            id="single",
+        ),
+        pytest.param(
+            [
+                "(MIT OR Apache-2.0) AND (ISC OR (MIT AND BSD-3-Clause))",
+                "Apache-2.0 AND (MIT OR (ISC AND (BSD-2-Clause OR MIT)))",
+                "MIT",
+                "(ISC OR (MIT AND BSD-3-Clause)) AND (Apache-2.0 OR MIT)",
+                "MPL-2.0 OR (GPL-2.0-only AND (MIT OR ISC))",
+            ],
+            id="multiple",
+        ),
+    ],
+)
+def test_license_data_license_expression_nested(expressions: list[str]) -> None:
+    data = LicenseData(
+        directory=Path("/vendor"),
+        license_map={
+            Path(f"{index}/LICENSE"): expression
+            for index, expression in enumerate(expressions)
+        },
+        undetected_licenses=frozenset(),
+        unmatched_manual_licenses=(),
+        extra_license_files=(),
+        detector_name="test",
+    )
+    # The expression used to be calculated with combine_licenses()
+    assert data.license_expression == combine_licenses(
+        *data.license_set, validate=False, strict=False
+    )
+
+
+def test_license_data_paths() -> None:
+    directory = Path("/vendor")
+    license_map = {Path("b/LICENSE"): "MIT", Path("a/LICENSE"): "Apache-2.0"}
+    undetected = frozenset({Path("a/COPYING"), Path("/abs/LICENSE")})
+    data = LicenseData(
+        directory=directory,
+        license_map=license_map,
+        undetected_licenses=undetected,
+        unmatched_manual_licenses=(),
+        extra_license_files=(),
+        detector_name="test",
+    )
+    assert isinstance(data.license_map, PathMap)
+    assert isinstance(data.undetected_licenses, PathSet)
+    assert data.license_map.table is data.undetected_licenses.table
+    assert data.license_map == license_map
+    assert list(data.license_map.items()) == list(license_map.items())
+    assert data.license_map[Path("a/LICENSE")] == "Apache-2.0"
+    assert "a/LICENSE" not in data.license_map
+    with pytest.raises(KeyError):
+        data.license_map[Path("c/LICENSE")]
+    assert data.undetected_licenses == undetected
+    assert hash(data.undetected_licenses) == hash(undetected)
+    assert data.undetected_licenses - {Path("a/COPYING")} == {Path("/abs/LICENSE")}
+    assert data.license_file_paths == tuple(
+        sorted(directory / path for path in [*license_map, *undetected])
+    )
+    assert data.license_file_paths[-1] == directory / "b/LICENSE"
+    assert data == data.replace(license_map=dict(license_map))
+
+
+def test_license_data_write_json() -> None:
+    payload = {
+        "a\nb": {"float": 1.5, "none": None, "list": [], "dict": {}},
+        "nested": [{"x": [1, "\u00f1\t"]}],
+    }
+    data = ScancodeLicenseData(
+        directory=Path("/vendor"),
+        license_map={Path("\u00fc/LICENSE"): "MIT"},
+        undetected_licenses=frozenset(),
+        unmatched_manual_licenses=(),
+        extra_license_files=(),
+        detector_name="scancode",
+        scancode_license_data=payload,  # type: ignore[arg-type]
+    )
+    buffer = io.StringIO()
+    data.write_json(buffer)
+    jsonable = data.to_jsonable()
+    assert buffer.getvalue() == json.dumps(jsonable, indent=2)
+    assert jsonable["scancode_license_data"] == payload
+    assert jsonable["scancode_license_data"] is not payload
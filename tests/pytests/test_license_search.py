@@ -0,0 +1,293 @@
+# Copyright (C) 2025 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from go_vendor_tools.license_detection.search import (
+    DEFAULT_FILE_TYPES,
+    LICENSE_FILE_TYPE,
+    LicenseFileClassifier,
+    LicenseRegexFileType,
+    find_license_files,
+    group_license_files,
+    iter_license_files,
+    split_license_files,
+)
+
+TREE_FILES = (
+    "LICENSE",
+    "LICENSE.docs",
+    "NOTICE",
+    "main.go",
+    "license.go",
+    "LICENSES/MIT.txt",
+    "docs/COPYING",
+    "vendor/modules.txt",
+    "vendor/example.com/a/LICENSE",
+    "vendor/example.com/a/LICENSE.docs",
+    "vendor/example.com/a/AUTHORS",
+    "vendor/example.com/a/LICENSES/ISC.txt",
+    "vendor/example.com/a/LICENSES/nested/Apache-2.0.txt",
+    "vendor/example.com/a/sub/LICENSES/BSD-3-Clause.txt",
+    "vendor/example.com/b/COPYING",
+    "vendor/example.com/excluded/LICENSE",
+    "vendor/example.com/c/LICENSE.excluded",
+)
+
+
+@pytest.fixture
+def license_tree(tmp_path: Path) -> Path:
+    for name in TREE_FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    (tmp_path / "vendor/example.com/link").symlink_to(tmp_path / "vendor/example.com/a")
+    return tmp_path
+
+
+def test_find_license_files(license_tree: Path) -> None:
+    result = find_license_files(
+        license_tree,
+        relative_paths=True,
+        exclude_directories=["vendor/example.com/excluded/"],
+        exclude_files=["vendor/example.com/c/LICENSE.excluded"],
+        reuse_roots=["vendor/example.com/a"],
+    )
+    expected = {
+        "license": [
+            "LICENSE",
+            "LICENSE.docs",
+            "docs/COPYING",
+            "vendor/example.com/a/LICENSE",
+            "vendor/example.com/a/sub/LICENSES/BSD-3-Clause.txt",
+            "vendor/example.com/b/COPYING",
+        ],
+        "notice": ["NOTICE", "vendor/example.com/a/AUTHORS"],
+        "reuse": ["LICENSES/MIT.txt", "vendor/example.com/a/LICENSES/ISC.txt"],
+    }
+    assert {key: sorted(value) for key, value in result.items()} == expected
+
+
+def test_find_license_files_full_paths(license_tree: Path) -> None:
+    relative = find_license_files(license_tree, relative_paths=True)
+    full = find_license_files(license_tree, relative_paths=False)
+    assert full == {
+        key: [os.path.join(license_tree, path) for path in value]
+        for key, value in relative.items()
+    }
+
+
+def test_find_license_files_missing(tmp_path: Path) -> None:
+    assert find_license_files(tmp_path / "missing", relative_paths=True) == {
+        "license": [],
+        "notice": [],
+        "reuse": [],
+    }
+
+
+def _classify_naive(name: str, in_subdir: bool) -> str | None:
+    for ft in DEFAULT_FILE_TYPES:
+        if (
+            ft.regex.fullmatch(name)
+            and not (ft.exclude_regex and ft.exclude_regex.fullmatch(name))
+            and not (
+                in_subdir
+                and ft.exclude_subdir_regex
+                and ft.exclude_subdir_regex.fullmatch(name)
+            )
+        ):
+            return ft.name
+    return None
+
+
+@pytest.mark.parametrize("in_subdir", [False, True])
+@pytest.mark.parametrize(
+    "name",
+    [
+        "LICENSE",
+        "LICENSE.docs",
+        "LICENSE.md",
+        "license.go",
+        "license.py",
+        "COPYING",
+        "COPYING.LESSER",
+        "APACHE-2.0.txt",
+        "Apache-2.0.txt",
+        "mit-license.txt",
+        "NOTICE",
+        "NOTICE.txt",
+        "AUTHORS",
+        "PATENTS.go",
+        "README.md",
+        "doc.go",
+        "LICENSE\nfoo",
+    ],
+)
+def test_license_file_classifier(name: str, in_subdir: bool) -> None:
+    classifier = LicenseFileClassifier()
+    expected = _classify_naive(name, in_subdir)
+    assert classifier.classify(name, in_subdir) == expected
+    # Cached
+    assert classifier.classify(name, in_subdir) == expected
+
+
+def test_license_file_classifier_empty() -> None:
+    assert LicenseFileClassifier([]).classify("LICENSE") is None
+
+
+def test_license_file_classifier_order() -> None:
+    notice = LicenseRegexFileType("notice", re.compile("LICENSE|NOTICE"))
+    classifier = LicenseFileClassifier([notice, LICENSE_FILE_TYPE])
+    assert classifier.classify("LICENSE") == "notice"
+    assert classifier.classify("LICENSE.md") == "license"
+    assert classifier.classify("LICENSE.docs", in_subdir=True) is None
+
+
+def test_find_license_files_modules(tmp_path: Path) -> None:
+    for name in (
+        "LICENSE",
+        "docs/COPYING",
+        "web/node_modules/pkg/LICENSE",
+        "vendor/modules.txt",
+        "vendor/example.com/LICENSE",
+        "vendor/example.com/a/LICENSE",
+        "vendor/example.com/a/LICENSES/ISC.txt",
+        "vendor/example.com/a/third_party/COPYING",
+        "vendor/example.com/a/third_party/deep/LICENSE",
+        "vendor/example.com/a/b/LICENSE",
+        "vendor/example.com/a/b/c/d/LICENSE",
+    ):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    module_roots = ["vendor/example.com/a", "vendor/example.com/a/b"]
+    result = find_license_files(
+        tmp_path,
+        relative_paths=True,
+        reuse_roots=module_roots,
+        module_roots=module_roots,
+        modules_only=True,
+        max_depth=1,
+    )
+    expected = {
+        "license": [
+            "LICENSE",
+            "docs/COPYING",
+            "vendor/example.com/a/LICENSE",
+            "vendor/example.com/a/b/LICENSE",
+            "vendor/example.com/a/third_party/COPYING",
+        ],
+        "notice": [],
+        "reuse": ["vendor/example.com/a/LICENSES/ISC.txt"],
+    }
+    assert {key: sorted(value) for key, value in result.items()} == expected
+    # REUSE directories are walked even when they're past max_depth
+    result = find_license_files(
+        tmp_path,
+        relative_paths=True,
+        reuse_roots=module_roots,
+        module_roots=module_roots,
+        modules_only=True,
+        max_depth=0,
+    )
+    assert result["reuse"] == ["vendor/example.com/a/LICENSES/ISC.txt"]
+    assert sorted(result["license"]) == [
+        "LICENSE",
+        "vendor/example.com/a/LICENSE",
+        "vendor/example.com/a/b/LICENSE",
+    ]
+
+
+@pytest.mark.parametrize("modules_only", [False, True])
+def test_find_license_files_jobs(license_tree: Path, modules_only: bool) -> None:
+    kwargs: dict[str, Any] = {
+        "relative_paths": True,
+        "exclude_directories": ["vendor/example.com/excluded"],
+        "reuse_roots": ["vendor/example.com/a"],
+        "module_roots": [
+            "vendor/example.com/a",
+            "vendor/example.com/b",
+            "vendor/example.com/c",
+            "vendor/example.com/excluded",
+        ],
+        "modules_only": modules_only,
+        "max_depth": 1,
+    }
+    expected = find_license_files(license_tree, **kwargs)
+    if not modules_only:
+        assert expected == find_license_files(
+            license_tree,
+            relative_paths=True,
+            exclude_directories=["vendor/example.com/excluded"],
+            reuse_roots=["vendor/example.com/a"],
+        )
+    assert "vendor/example.com/excluded/LICENSE" not in expected["license"]
+    for jobs in (2, 4):
+        assert find_license_files(license_tree, **kwargs, jobs=jobs) == expected
+
+
+def test_iter_license_files(license_tree: Path) -> None:
+    iterator = iter_license_files(license_tree, relative_paths=True)
+    assert isinstance(iterator, Iterator)
+    assert group_license_files(iterator) == find_license_files(
+        license_tree, relative_paths=True
+    )
+
+
+def test_split_license_files() -> None:
+    files = [
+        ("notice", "NOTICE"),
+        ("license", "vendor/b/LICENSE"),
+        ("reuse", "LICENSES/MIT.txt"),
+        ("license", "LICENSE"),
+    ]
+    license_file_lists = group_license_files(())
+    license_paths = split_license_files(files, license_file_lists)
+    assert next(license_paths) == "vendor/b/LICENSE"
+    assert license_file_lists["notice"] == ["NOTICE"]
+    assert list(license_paths) == ["LICENSE"]
+    assert license_file_lists == {
+        "license": ["LICENSE", "vendor/b/LICENSE"],
+        "notice": ["NOTICE"],
+        "reuse": ["LICENSES/MIT.txt"],
+    }
+
+
+def test_find_license_files_exclude_globs(
+    license_tree: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scanned: list[str] = []
+    scandir = os.scandir
+
+    def scandir_spy(path: Any) -> Any:
+        scanned.append(os.path.relpath(path, license_tree))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir_spy)
+    result = find_license_files(
+        license_tree,
+        relative_paths=True,
+        exclude_globs=["vendor/example.com/[ae]*/", "*.docs", "docs/COPYING"],
+    )
+    expected = {
+        "license": [
+            "LICENSE",
+            "vendor/example.com/b/COPYING",
+            "vendor/example.com/c/LICENSE.excluded",
+        ],
+        "notice": ["NOTICE"],
+        "reuse": ["LICENSES/MIT.txt"],
+    }
+    assert result == expected
+    # Excluded directories are pruned instead of being filtered afterwards
+    assert "vendor/example.com/a" not in scanned
+    assert "vendor/example.com/excluded" not in scanned
+    assert "vendor/example.com/b" in scanned
@@ -3,9 +3,18 @@
 
 from __future__ import annotations
 
+import importlib.metadata
+import random
+import subprocess
+import sys
+from pathlib import Path
+from textwrap import dedent
+
 import pytest
 
+from go_vendor_tools import licensing
 from go_vendor_tools.licensing import (
+    LicenseAccumulator,
     combine_licenses,
     compare_licenses,
     simplify_license,
@@ -48,3 +57,185 @@ def test_simplify_license(expression: str, expected: str) -> None:
 def test_combine_licenses() -> None:
     combined = combine_licenses("Apache-2.0 OR MIT", "ISC")
     assert str(combined) == "ISC AND (Apache-2.0 OR MIT)"
+
+
+@pytest.mark.parametrize(
+    "expressions",
+    [
+        pytest.param(["Apache-2.0 OR MIT", "ISC"]),
+        pytest.param(["MIT", "(MIT AND ISC) AND MIT", "BSD-3-Clause AND MIT"]),
+        pytest.param(["MIT OR Apache-2.0", "Apache-2.0 OR MIT", "Apache-2.0"]),
+        pytest.param(
+            ["LicenseRef-scancode-public-domain", "MPL-2.0 OR (GPL-2.0+ AND MIT)"]
+        ),
+        pytest.param(["GPL-2.0-only WITH Classpath-exception-2.0", "", None]),
+    ],
+)
+def test_license_accumulator(expressions: list[str | None]) -> None:
+    expected = combine_licenses(*expressions, validate=False, strict=False)
+    accumulator = LicenseAccumulator(validate=False, strict=False)
+    for expression in expressions:
+        accumulator.add(expression)
+    assert accumulator.expression == expected
+    assert str(accumulator) == expected
+    assert LicenseAccumulator(
+        expressions, validate=False, strict=False
+    ).expressions == (accumulator.expressions)
+
+
+def _random_expression(rng: random.Random, depth: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(
+            [
+                "MIT",
+                "ISC",
+                "Apache-2.0",
+                "BSD-2-Clause",
+                "BSD-3-Clause",
+                "MPL-2.0",
+                "GPL-2.0-only",
+                "LicenseRef-Fedora-Public-Domain",
+            ]
+        )
+    operator = rng.choice([" AND ", " OR "])
+    args = (_random_expression(rng, depth - 1) for _ in range(rng.randint(2, 3)))
+    return f"({operator.join(args)})"
+
+
+def _random_expressions(seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [_random_expression(rng, 3) for _ in range(rng.randint(1, 4))]
+
+
+@pytest.mark.parametrize(
+    "expressions",
+    [
+        pytest.param(
+            [
+                "(((ISC OR MPL-2.0) AND (MPL-2.0 OR GPL-2.0-only)) OR"
+                " (LicenseRef-Fedora-Public-Domain OR (BSD-2-Clause OR BSD-3-Clause)))"
+            ],
+            id="single-nested",
+        ),
+        *(
+            pytest.param(_random_expressions(seed), id=f"random-{seed}")
+            for seed in range(50)
+        ),
+    ],
+)
+def test_license_accumulator_nested(expressions: list[str]) -> None:
+    expected = combine_licenses(*expressions, validate=False, strict=False)
+    assert LicenseAccumulator(expressions, validate=False, strict=False).expression == (
+        expected
+    )
+
+
+def test_license_accumulator_empty() -> None:
+    accumulator = LicenseAccumulator(["", None])
+    assert not accumulator
+    assert accumulator.expression is None
+
+
+@pytest.mark.parametrize(
+    "expression, strict",
+    [
+        pytest.param("MIT", True),
+        pytest.param(" mit ", True),
+        pytest.param("GPL-2.0+", True),
+        pytest.param("LicenseRef-scancode-public-domain", True),
+        pytest.param("GPL-2.0-only WITH Classpath-exception-2.0", True),
+        pytest.param("gpl-2.0-only with classpath-exception-2.0", True),
+        pytest.param("Classpath-exception-2.0 WITH MIT", False),
+    ],
+)
+def test_parse_single_key(expression: str, strict: bool) -> None:
+    fast = licensing._parse_single_key(expression, strict)
+    assert fast is not None
+    full = licensing.get_licensing().parse(expression, strict=strict)
+    assert type(fast) is type(full)
+    assert fast == full
+    assert str(fast) == str(full)
+
+
+@pytest.mark.parametrize(
+    "expression, strict",
+    [
+        pytest.param("MIT OR Apache-2.0", True),
+        pytest.param("(MIT)", True),
+        pytest.param("Not-A-Real-License", True),
+        pytest.param("Classpath-exception-2.0", True),
+        pytest.param("MIT WITH Apache-2.0", True),
+        pytest.param("MIT WITH", True),
+    ],
+)
+def test_parse_single_key_fallback(expression: str, strict: bool) -> None:
+    assert licensing._parse_single_key(expression, strict) is None
+
+
+def test_licensing_lazy() -> None:
+    assert licensing.licensing is licensing.get_licensing()
+    # Use a fresh interpreter, as other tests already created the object
+    code = dedent("""
+        from go_vendor_tools import licensing
+        from go_vendor_tools.cli import go_vendor_license
+
+        go_vendor_license.main(["--detector=askalono", "generate_buildrequires"])
+        assert licensing.get_licensing.cache_info().currsize == 0
+        """)
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+def test_license_index_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        licensing, "PREBUILT_LICENSE_INDEX_PATH", tmp_path / "prebuilt.json"
+    )
+    expected = licensing.build_fedora_license_index()
+    cache_path = licensing.get_license_index_cache_path()
+    assert not cache_path.exists()
+    assert licensing.get_fedora_license_index() == expected
+    assert cache_path.is_file()
+    key = licensing.get_license_index_key()
+    assert licensing.load_license_index(cache_path, key) == expected
+    assert (
+        licensing.load_license_index(cache_path, {**key, "go_vendor_tools": ""}) is None
+    )
+    assert licensing.load_license_index(tmp_path / "missing.json", key) is None
+    # The key doesn't depend on license_expression's location
+    assert key["license_expression"] == importlib.metadata.version("license-expression")
+
+    # The prebuilt index is preferred
+    licensing.dump_license_index(tmp_path / "prebuilt.json", expected[:10])
+    assert licensing.get_fedora_license_index() == expected[:10]
+
+
+def test_expression_cache() -> None:
+    cache = licensing.ExpressionCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.cache_info() == licensing.ExpressionCacheInfo(1, 1, 1, 2, 2)
+    cache.resize(1)
+    assert cache.cache_info().evictions == 2
+    assert cache.get("c") == 3
+    cache.resize(None)
+    for index in range(10):
+        cache.put(index, index)
+    assert cache.cache_info().currsize == 11
+    cache.cache_clear()
+    assert cache.cache_info() == licensing.ExpressionCacheInfo(0, 0, 0, None, 0)
+
+
+def test_expression_cache_decorator() -> None:
+    info = licensing.get_expression_cache_info()
+    assert set(info) == {"parse", "simplify_license"}
+    simplify_license.cache_clear()  # type: ignore[attr-defined]
+    assert simplify_license("MIT AND MIT") == "MIT"
+    assert simplify_license("MIT AND MIT") == "MIT"
+    assert simplify_license("MIT AND MIT", validate=False) == "MIT"
+    assert simplify_license.cache_info() == (  # type: ignore[attr-defined]
+        licensing.ExpressionCacheInfo(
+            1, 2, 0, licensing.DEFAULT_EXPRESSION_CACHE_SIZE, 2
+        )
+    )
@@ -73,6 +73,8 @@ class Evaluator:
         ):
             print(f"Setting {CHECK_DISABLE_MACRO} to 0")
             defines[CHECK_DISABLE_MACRO] = "0"
+        # Make the default license cache directory predictable
+        defines.setdefault("_builddir", "BUILDDIR")
         for name, value in defines.items():
             cmd.extend(("--define", f"{name} {value}"))
         for name in undefines:
@@ -98,7 +100,7 @@ def test_go_vendor_license_install():
     defines = {"NAME": "foo", "buildroot": "BUILDROOT"}
     assert (
         evaluator("%go_vendor_license_install", defines=defines).stdout
-        == "go_vendor_license install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list\n"  # noqa: E501
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list\n"  # noqa: E501
     )
 
 
@@ -106,7 +108,48 @@ def test_go_vendor_license_install_M():
     defines = {"NAME": "foo", "buildroot": "BUILDROOT"}
     assert (
         evaluator("%go_vendor_license_install -M", defines=defines).stdout
-        == "go_vendor_license install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list -M\n"  # noqa: E501
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list -M\n"  # noqa: E501
+    )
+
+
+def test_go_vendor_license_install_data_file():
+    defines = {
+        "NAME": "foo",
+        "buildroot": "BUILDROOT",
+        "go_vendor_license_data_file": "data.json",
+        CHECK_DISABLE_MACRO: "0",
+    }
+    assert (
+        evaluator("%go_vendor_license_install", defines=defines).stdout
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list --write-json data.json\n"  # noqa: E501
+    )
+    defines[CHECK_DISABLE_MACRO] = "1"
+    assert (
+        evaluator("%go_vendor_license_install", defines=defines).stdout
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list\n"  # noqa: E501
+    )
+
+
+def test_go_vendor_license_cache():
+    defines = {
+        "NAME": "foo",
+        "buildroot": "BUILDROOT",
+        "LICENSE": "MIT",
+        "go_vendor_license_cache": "0",
+    }
+    assert (
+        evaluator("%go_vendor_license_install", defines=defines).stdout
+        == "go_vendor_license --no-cache install --destdir BUILDROOT --install-directory /usr/share/licenses/foo --filelist licenses.list\n"  # noqa: E501
+    )
+    assert (
+        evaluator("%go_vendor_license_check", defines=defines).stdout
+        == "go_vendor_license --no-cache report all --verify 'MIT'\n"
+    )
+    defines["go_vendor_license_cache"] = "1"
+    defines["go_vendor_license_cache_dir"] = "CACHE"
+    assert (
+        evaluator("%go_vendor_license_check", defines=defines).stdout
+        == "go_vendor_license --cache-dir CACHE report all --verify 'MIT'\n"
     )
 
 
@@ -151,15 +194,31 @@ def test_go_vendor_license_check_disable_default():
 def test_go_vendor_license_check():
     assert (
         evaluator("%go_vendor_license_check", {"LICENSE": "MIT"}).stdout
-    ) == "go_vendor_license report all --verify 'MIT'\n"
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache report all --verify 'MIT'\n"  # noqa: E501
+    )
+
+
+def test_go_vendor_license_check_data_file():
+    assert (
+        (
+            evaluator(
+                "%go_vendor_license_check",
+                {"LICENSE": "MIT", "go_vendor_license_data_file": "data.json"},
+            ).stdout
+        )
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache report all --reuse-json data.json --verify 'MIT'\n"  # noqa: E501
+    )
 
 
 def test_go_vendor_license_check_args():
     assert (
-        evaluator(
-            "%go_vendor_license_check GPL-2.0-only BSD-3-Clause", {"LICENSE": "MIT"}
-        ).stdout
-    ) == "go_vendor_license report all --verify 'GPL-2.0-only BSD-3-Clause'\n"
+        (
+            evaluator(
+                "%go_vendor_license_check GPL-2.0-only BSD-3-Clause", {"LICENSE": "MIT"}
+            ).stdout
+        )
+        == "go_vendor_license --cache-dir BUILDDIR/.go-vendor-license-cache report all --verify 'GPL-2.0-only BSD-3-Clause'\n"  # noqa: E501
+    )
 
 
 def test_go_vendor_license_buildrequires():